@@ -1,41 +1,242 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context, g
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import subprocess
+import argparse
+import json
+import time
+import uuid
+import threading
 import os
 
+import fetch as fetcher
+import metrics
+from cache import get_cache
+from jobs import JobStore
+from metrics import get_metrics, log_event
+from problem_index import get_index
+
 app = Flask(__name__)
 
+# Number of pooled fetch workers and whether to fall back to one `fetch.py` process per request.
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS", "4"))
+FETCH_ISOLATE = os.environ.get("FETCH_ISOLATE", "0") == "1"
+FETCH_TIMEOUT = float(os.environ.get("FETCH_TIMEOUT", "120"))
+MAX_BATCH_CONCURRENCY = int(os.environ.get("MAX_BATCH_CONCURRENCY", "16"))
+FILE_TYPES = ("py", "cpp")
+
+executor = None
+job_store = JobStore()
+
+def start_workers(worker_count):
+    """
+    Create the bounded fetch pool and start every worker thread up front,
+    so the first requests do not pay for thread creation.
+    """
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=False)
+    executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="fetch-worker")
+    # Each warmup waits until all of them are running, so an idle thread cannot pick up a
+    # second one and every worker thread has to be created
+    started = threading.Barrier(worker_count)
+    warmups = [executor.submit(started.wait) for _ in range(worker_count)]
+    for warmup in warmups:
+        warmup.result()
+    return executor
+
+def get_executor():
+    if executor is None:
+        start_workers(FETCH_WORKERS)
+    return executor
+
+def run_fetch_isolated(problem_url, file_type, offline=False, refresh=False):
+    """
+    Run fetch.py in its own interpreter and return its structured JSON result.
+    """
+    command = ['python', 'fetch.py', '--url', problem_url, '--file_type', file_type, '--json']
+    if offline:
+        command.append('--offline')
+    if refresh:
+        command.append('--refresh')
+    result = subprocess.run(command, capture_output=True, text=True, timeout=FETCH_TIMEOUT)
+    try:
+        fetch_result = json.loads(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        fetch_result = fetcher.fetch_error("Failed to run the fetch script", kind="isolated_process",
+                                           details=result.stderr)
+    # The child's own metrics die with it, so record its stage timings here
+    get_metrics().record_fetch(fetch_result)
+    return fetch_result
+
+def submit_fetch(problem_url, file_type, offline=False, refresh=False, request_id=None):
+    """
+    Start a fetch job on the worker pool. Requests for a problem and language that is
+    already being fetched with the same offline and refresh options join the in-flight job
+    instead of scraping it again, so a refresh never gets the result of a cached fetch and an
+    offline request never waits on the network. When the job finishes, a structured log line
+    is written for the request.
+    """
+    target = run_fetch_isolated if FETCH_ISOLATE else fetcher.save_problem_and_open
+    key = (fetcher.problem_slug(problem_url), file_type.lower(), offline, refresh)
+    job = job_store.submit(key, get_executor(), target, problem_url, file_type, offline, refresh)
+
+    def log_fetch(future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = fetcher.fetch_error(str(e))
+        log_event("fetch", request_id=request_id, job_id=job.id, problem_url=problem_url, file_type=file_type,
+                  status=result.get("status"), cache=result.get("cache"), kind=result.get("kind"),
+                  timings=result.get("timings"), downloaded_bytes=result.get("downloaded_bytes"))
+    job.future.add_done_callback(log_fetch)
+    return job
+
+@app.before_request
+def start_request():
+    g.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex[:16]
+    g.started = time.perf_counter()
+
+@app.after_request
+def finish_request(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    elapsed = time.perf_counter() - g.started
+    registry = get_metrics()
+    registry.http_requests.inc(endpoint=endpoint, status=response.status_code)
+    registry.http_duration.observe(elapsed, endpoint=endpoint)
+    response.headers["X-Request-ID"] = g.request_id
+    log_event("request", request_id=g.request_id, method=request.method, path=request.path,
+              status=response.status_code, duration=round(elapsed, 6))
+    return response
+
+def request_error(message, kind, status_code):
+    get_metrics().errors.inc(kind=kind)
+    return jsonify({"error": message, "request_id": g.request_id}), status_code
+
 @app.route('/fetch', methods=['POST'])
 def fetch():
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
-        return jsonify({"error": "Invalid or missing JSON"}), 400
+        return request_error("Invalid or missing JSON", "invalid_request", 400)
 
     problem_url = data.get("problem_url")
     file_type = data.get("file_type")
 
     if not problem_url or not file_type:
-        return jsonify({"error": "Missing required fields"}), 400
+        return request_error("Missing required fields", "invalid_request", 400)
+    if not isinstance(problem_url, str):
+        return request_error("problem_url must be a string", "invalid_request", 400)
+    if str(file_type).lower() not in FILE_TYPES:
+        return request_error(f"file_type must be one of {', '.join(FILE_TYPES)}", "invalid_request", 400)
 
     try:
-        # Prepare the command to run the fetch.py script
-        command = ['python', 'fetch.py', '--url', problem_url, '--file_type', file_type]
+        job = submit_fetch(problem_url, file_type, bool(data.get("offline")), bool(data.get("refresh")),
+                           request_id=g.request_id)
 
-        # Run the fetch.py script
-        result = subprocess.run(command, capture_output=True, text=True)
+        # In job mode return immediately and let the client poll /jobs/<id>
+        if data.get("async"):
+            return jsonify({"message": "Accepted", "job_id": job.id, "status": job.status}), 202
 
-        if result.returncode != 0:
-            return jsonify({"error": "Failed to run the fetch script", "details": result.stderr}), 500
+        result = job.future.result(timeout=FETCH_TIMEOUT)
 
-        # Return success message with the generated file path
+        if result["status"] != "ok":
+            return jsonify({"error": result["error"], "details": result}), 500
+
+        # Return success message with the generated file paths
         return jsonify({
             "message": "Success",
             "problem_url": problem_url,
             "file_type": file_type,
-            "output": result.stdout
+            "result": result
         })
 
+    except FutureTimeoutError:
+        return request_error(f"Fetch did not finish within {FETCH_TIMEOUT:g}s", "timeout", 504)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return request_error(str(e), "server", 500)
+
+@app.route('/fetch/batch', methods=['POST'])
+def fetch_batch():
+    data = request.get_json(silent=True)
+    if not data:
+        return request_error("Invalid or missing JSON", "invalid_request", 400)
+
+    problem_urls = data.get("problem_urls")
+    file_type = data.get("file_type")
+
+    if not problem_urls or not isinstance(problem_urls, list) or not file_type:
+        return request_error("Missing required fields", "invalid_request", 400)
+    if not all(isinstance(problem_url, str) and problem_url for problem_url in problem_urls):
+        return request_error("problem_urls must be a list of non-empty strings", "invalid_request", 400)
+    if str(file_type).lower() not in FILE_TYPES:
+        return request_error(f"file_type must be one of {', '.join(FILE_TYPES)}", "invalid_request", 400)
+
+    try:
+        concurrency = int(data.get("concurrency", fetcher.BATCH_CONCURRENCY))
+    except (ValueError, TypeError):
+        return request_error("concurrency must be an integer", "invalid_request", 400)
+    if concurrency < 1:
+        return request_error("concurrency must be at least 1", "invalid_request", 400)
+    concurrency = min(concurrency, MAX_BATCH_CONCURRENCY)
+    results = fetcher.fetch_many(problem_urls, file_type, concurrency,
+                                 bool(data.get("offline")), bool(data.get("refresh")))
+
+    # Stream one JSON line per problem as soon as it finishes
+    def generate():
+        for result in results:
+            yield json.dumps(result) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(get_cache().get_stats())
+
+@app.route('/problems', methods=['GET'])
+def list_problems():
+    """
+    Search the problem index with ?q=..., or list the most recently fetched problems.
+    """
+    try:
+        limit = min(int(request.args.get("limit", 20)), 200)
+    except ValueError:
+        return request_error("limit must be an integer", "invalid_request", 400)
+    query = request.args.get("q", "")
+    index = get_index()
+    problems = index.search(query, limit) if query else index.list(limit)
+    return jsonify({"problems": problems, "total": index.count()})
+
+@app.route('/problems/<slug>', methods=['GET'])
+def problem_details(slug):
+    problem = get_index().get(slug)
+    if problem is None:
+        return jsonify({"error": "Problem has not been fetched"}), 404
+    return jsonify(problem)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(get_metrics().render(), mimetype="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    parser = argparse.ArgumentParser(description="Serve the LeetCode fetch API.")
+    parser.add_argument('--workers', type=int, default=FETCH_WORKERS, help="Number of pooled fetch workers")
+    parser.add_argument('--isolate', action='store_true', default=FETCH_ISOLATE,
+                        help="Run every fetch in a separate fetch.py process")
+    parser.add_argument('--json-logs', action='store_true', default=metrics.JSON_LOGS,
+                        help="Write one JSON log line per request and per fetch to stderr")
+    parser.add_argument('--host', default="127.0.0.1", help="Address to listen on")
+    parser.add_argument('--port', type=int, default=5000, help="Port to listen on")
+    parser.add_argument('--no-debug', action='store_true', help="Run without the debugger and auto-reloader")
+    args = parser.parse_args()
+
+    FETCH_WORKERS = args.workers
+    FETCH_ISOLATE = args.isolate
+    metrics.JSON_LOGS = args.json_logs
+    start_workers(FETCH_WORKERS)
+    app.run(host=args.host, port=args.port, debug=not args.no_debug)
@@ -0,0 +1,125 @@
+"""
+Compare the targeted page extraction in extract.py with a full BeautifulSoup parse.
+
+Usage: python benchmarks/bench_extract.py [page.html | pages_dir ...] [--repeat N] [--json]
+
+Pages default to the recorded corpus in benchmarks/pages (`bench_server.py record` saves them);
+a synthetic LeetCode-sized page is used, with a warning, when no recorded pages are available.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extract import extract_from_html
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+def synthetic_page():
+    """
+    Build a page shaped like a LeetCode problem: a head with the preload links, inline styles
+    and inline scripts a real page carries before its description meta, then the description,
+    a large body and a big __NEXT_DATA__ payload at the end. The bulk before the description is
+    what the targeted parser still has to read, so leaving it out would flatter the early exit.
+    """
+    description = (
+        "Can you solve this real interview question? Two Sum - Given an array of integers nums...\n"
+        "Example 1:\nInput: nums = [2,7,11,15], target = 9\nOutput: [0,1]\n"
+    )
+    links = "".join(f'<link rel="preload" href="/_next/static/chunks/{i}-3f9a1c.js" as="script"/>' for i in range(80))
+    styles = "".join(
+        f'<style data-emotion="css {i:x}">.css-{i:x}{{display:flex;margin:0 {i % 16}px;color:rgb(38 38 38 / 75%)}}'
+        f'.dark .css-{i:x}:hover{{background-color:rgb(255 255 255 / 10%)}}</style>' for i in range(1500)
+    )
+    scripts = "".join(
+        f'<script>(function(w,d){{var c{i}={json.dumps({"id": i, "flags": list(range(200))})};'
+        f'w.__cfg=w.__cfg||[];w.__cfg.push(c{i});}})(window,document);</script>' for i in range(40)
+    )
+    body = "".join(f'<div class="row"><span>item {i}</span><a href="/p/{i}">link</a></div>' for i in range(20000))
+    next_data = json.dumps({"props": {"pageProps": {"items": list(range(50000))}}})
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"/>{links}{styles}{scripts}'
+        f'<title>Two Sum - LeetCode</title><meta name="description" content="{description}"/></head>'
+        f'<body>{body}<script id="__NEXT_DATA__" type="application/json">{next_data}</script></body></html>'
+    )
+
+def load_pages(paths):
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            pages.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".html")
+            )
+        else:
+            pages.append(path)
+    loaded = []
+    for path in pages:
+        with open(path, "r", encoding="utf-8") as file:
+            loaded.append((os.path.basename(path), file.read()))
+    return loaded or [("synthetic.html", synthetic_page())]
+
+def full_tree(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    meta = soup.find("meta", attrs={"name": "description"})
+    return meta.get("content", "").strip() if meta else None
+
+def targeted(html):
+    return extract_from_html(html)[0]
+
+def targeted_with_next_data(html):
+    return extract_from_html(html, want_next_data=True)[0]
+
+def measure(function, html, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(html)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"min_ms": min(timings) * 1000, "median_ms": statistics.median(timings) * 1000, "peak_kb": peak / 1024}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark problem page extraction.")
+    parser.add_argument('pages', nargs='*', default=[PAGES_DIR], help="HTML files or directories of recorded pages")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per page and method")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    methods = {"targeted": targeted, "targeted+next_data": targeted_with_next_data}
+    try:
+        import bs4  # noqa: F401
+        methods["full_tree"] = full_tree
+    except ImportError:
+        print("beautifulsoup4 is not installed; skipping the full-tree baseline.", file=sys.stderr)
+
+    pages = load_pages([path for path in args.pages if os.path.exists(path)])
+    if [name for name, _ in pages] == ["synthetic.html"]:
+        print("Warning: no recorded pages found, so only the synthetic page was measured. Record real pages "
+              "with 'python benchmarks/bench_server.py record URL...' for figures that reflect LeetCode.",
+              file=sys.stderr)
+    results = []
+    for name, html in pages:
+        for method, function in methods.items():
+            result = measure(function, html, args.repeat)
+            result.update({"page": name, "method": method, "page_kb": len(html) / 1024})
+            results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'page':<30} {'method':<20} {'size KB':>9} {'min ms':>9} {'median ms':>10} {'peak KB':>10}")
+    for result in results:
+        print(f"{result['page']:<30} {result['method']:<20} {result['page_kb']:>9.1f} "
+              f"{result['min_ms']:>9.2f} {result['median_ms']:>10.2f} {result['peak_kb']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
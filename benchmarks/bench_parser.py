@@ -0,0 +1,107 @@
+"""
+Compare the single-pass literal parser in literals.py with the previous regex/eval parsing.
+
+Usage: python benchmarks/bench_parser.py [--sizes 100000,1000000] [--repeat N] [--json]
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from literals import parse_assignments, parse_input_with_type_and_structure
+
+def legacy_parse_input_with_type_and_structure(input_string):
+    """
+    The regex/eval parser that fetch.py and test.py used before literals.py.
+    """
+    variables = {}
+    pattern = r'(\w+)\s*=\s*(.+)'
+    matches = re.finditer(pattern, input_string)
+    for match in matches:
+        var, value = match.groups()
+        if value.startswith("[") and value.endswith("]"):
+            parsed_value = json.loads(value)
+            if isinstance(parsed_value, list) and all(isinstance(item, list) for item in parsed_value):
+                value_type = "vector of vectors"
+            else:
+                value_type = "list"
+        elif value.startswith('"') or value.startswith("'"):
+            parsed_value = value.strip('"').strip("'")
+            value_type = "string"
+        elif value.isdigit():
+            parsed_value = int(value)
+            value_type = "int"
+        elif re.match(r"^\d+\.\d+$", value):
+            parsed_value = float(value)
+            value_type = "float"
+        else:
+            parsed_value = eval(value)
+            value_type = type(parsed_value).__name__
+        variables[var] = (parsed_value, value_type)
+    return variables
+
+def legacy_eval_arguments(input_string):
+    """
+    The eval-based argument parsing test_python_solution used before literals.py.
+    """
+    return eval(f"dict({input_string})")
+
+def make_inputs(n):
+    rng = random.Random(n)
+    side = max(1, int(n ** 0.5))
+    numbers = json.dumps([rng.randint(-10 ** 9, 10 ** 9) for _ in range(n)], separators=(",", ":"))
+    grid = json.dumps([[rng.randint(0, 9) for _ in range(side)] for _ in range(side)], separators=(",", ":"))
+    words = json.dumps(["".join(rng.choices("abc,= ", k=5)) for _ in range(n // 10)])
+    return {
+        "single array": f"nums = {numbers}",
+        "array and int": f"nums = {numbers}, target = 7",
+        "grid": f"grid = {grid}",
+        "strings with , and =": f"words = {words}",
+    }
+
+def measure(function, text, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            function(text)
+        except Exception:
+            return None
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark test case input parsing.")
+    parser.add_argument('--sizes', type=str, default="100000,1000000", help="Comma-separated element counts")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per input")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    methods = {
+        "legacy regex": legacy_parse_input_with_type_and_structure,
+        "legacy eval": legacy_eval_arguments,
+        "literals typed": parse_input_with_type_and_structure,
+        "literals args": parse_assignments,
+    }
+    results = []
+    for n in (int(size) for size in args.sizes.split(",")):
+        for name, text in make_inputs(n).items():
+            for method, function in methods.items():
+                results.append({"n": n, "input": name, "method": method, "median_ms": measure(function, text, args.repeat)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'n':>9} {'input':<22} {'method':<16} {'median ms':>10}")
+    for result in results:
+        timing = f"{result['median_ms']:>10.2f}" if result["median_ms"] is not None else f"{'failed':>10}"
+        print(f"{result['n']:>9} {result['input']:<22} {result['method']:<16} {timing}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+End-to-end benchmark of the /fetch -> fetch -> file generation pipeline, fully offline.
+
+Usage:
+    python benchmarks/bench_server.py record https://leetcode.com/problems/two-sum/ ... [--urls-file FILE]
+    python benchmarks/bench_server.py run [--requests 200] [--concurrency 8] [--workers 4] [--latency 20]
+                                          [--backend auto] [--output benchmarks/baseline.json] [--compare OLD.json]
+
+`record` saves the GraphQL questionData response and the problem page of every URL into
+benchmarks/pages, which needs network access once. `run` serves that corpus from the local
+stub server (stub_server.py), starts app.py against it with temporary output, cache and index
+directories, sends /fetch requests at the given concurrency and reports requests per second,
+latency percentiles, the number of fetches the server actually ran (concurrent requests for the
+same problem and language join one fetch), the server's CPU time and peak RSS, and the wall time,
+CPU time and peak traced memory of every pipeline stage. Results are written to a JSON file; pass an older one
+with --compare to print the change of every figure.
+"""
+import os
+import re
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+import tracemalloc
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_server import create_server, PAGES_DIR
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def corpus_slugs(pages_dir):
+    names = os.listdir(pages_dir) if os.path.isdir(pages_dir) else []
+    return sorted({name.rsplit(".", 1)[0] for name in names if name.endswith((".json", ".html"))})
+
+def record(urls, pages_dir):
+    """
+    Download the questionData response and the page of every problem into the corpus.
+    """
+    from sessions import get_pool, LEETCODE_URL
+    from fetch import problem_slug, problem_page_url
+    from questions import question_request
+
+    os.makedirs(pages_dir, exist_ok=True)
+    pool = get_pool()
+    for url in urls:
+        slug = problem_slug(url)
+        response = pool.post(f"{LEETCODE_URL}/graphql", question_request(slug),
+                             headers={"Referer": problem_page_url(url), "Content-Type": "application/json"})
+        if response.status_code == 200:
+            with open(os.path.join(pages_dir, f"{slug}.json"), "wb") as file:
+                file.write(response.content)
+        page = pool.get(problem_page_url(url))
+        if page.status_code == 200:
+            with open(os.path.join(pages_dir, f"{slug}.html"), "wb") as file:
+                file.write(page.content)
+        print(f"{slug}: questionData {response.status_code}, page {page.status_code}")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def process_usage(pid):
+    """
+    CPU seconds (user + system) and peak RSS in KB of a process, from /proc. None where /proc is missing.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            fields = file.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status") as file:
+            peak = re.search(r"^VmHWM:\s+(\d+)", file.read(), re.M)
+    except OSError:
+        return None, None
+    ticks = os.sysconf("SC_CLK_TCK")
+    return (int(fields[11]) + int(fields[12])) / ticks, int(peak.group(1)) if peak else None
+
+def wait_for_server(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app.py exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/metrics")
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("app.py did not start in time")
+
+def stage_metrics(text):
+    """
+    Mean wall and CPU time per stage from the server's /metrics output.
+    """
+    stages = {}
+    for metric, key in (("leetcode_fetch_stage_seconds", "wall_ms"), ("leetcode_fetch_stage_cpu_seconds", "cpu_ms")):
+        sums = dict(re.findall(rf'^{metric}_sum{{stage="(\w+)"}} (\S+)$', text, re.M))
+        counts = dict(re.findall(rf'^{metric}_count{{stage="(\w+)"}} (\S+)$', text, re.M))
+        for stage, total in sums.items():
+            count = int(counts[stage])
+            entry = stages.setdefault(stage, {"count": count})
+            entry[key] = float(total) / count * 1000 if count else 0.0
+    return stages
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def fetch_targets(urls, file_type):
+    """
+    The (problem URL, file type) pairs requests cycle through. Each pair is a separate job key on
+    the server, so with "both" every problem gives two distinct fetches.
+    """
+    file_types = ["py", "cpp"] if file_type == "both" else [file_type]
+    return [(url, kind) for url in urls for kind in file_types]
+
+def fetch_count(text):
+    """
+    Fetches the server has run so far, from leetcode_fetches_total in its /metrics output.
+    """
+    return sum(int(float(value)) for value in re.findall(r"^leetcode_fetches_total\{.*\} (\S+)$", text, re.M))
+
+def get_metrics_text(port):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.request("GET", "/metrics")
+    text = connection.getresponse().read().decode()
+    connection.close()
+    return text
+
+def drive(port, targets, requests, concurrency, refresh):
+    """
+    Send `requests` /fetch requests from `concurrency` threads, each on its own keep-alive
+    connection, cycling through the (URL, file type) targets. Returns the latencies in seconds,
+    the status code counts and the elapsed wall time.
+    """
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                break
+            url, file_type = targets[index % len(targets)]
+            body = json.dumps({"problem_url": url, "file_type": file_type, "refresh": refresh})
+            start = time.perf_counter()
+            connection.request("POST", "/fetch", body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(client) for _ in range(concurrency)]:
+            future.result()
+    return latencies, statuses, time.perf_counter() - start
+
+def profile_stages(targets, env):
+    """
+    Fetch every corpus problem once in this process with tracemalloc running, to get the peak
+    memory of each stage. Done sequentially, since traced memory is shared by all threads.
+    """
+    os.environ.update(env)
+    import metrics
+    import fetch
+    metrics.TRACE_MEMORY = True
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for url, file_type in targets:
+            result = fetch.save_problem_and_open(url, file_type, refresh=True)
+            for stage, peak in result.get("memory_peaks", {}).items():
+                peaks.setdefault(stage, []).append(peak)
+    finally:
+        tracemalloc.stop()
+    return {stage: max(values) / 1024 for stage, values in peaks.items()}
+
+def run(args):
+    slugs = corpus_slugs(args.pages)
+    if not slugs:
+        print(f"No recorded problems in {args.pages}. Record some with the 'record' command first.")
+        sys.exit(1)
+    urls = [f"https://leetcode.com/problems/{slug}/" for slug in slugs]
+    targets = fetch_targets(urls, args.file_type)
+    if args.concurrency > len(targets):
+        print(f"Note: {len(targets)} distinct problem/language pairs for concurrency {args.concurrency}; "
+              "concurrent requests for the same pair join one fetch.")
+
+    stub = create_server(0, args.pages, args.latency, args.backend != "html")
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    workdir = tempfile.mkdtemp(prefix="leetcode-bench-")
+    env = {
+        "LEETCODE_BASE_URL": f"http://127.0.0.1:{stub.server_address[1]}",
+        "FETCH_BACKEND": args.backend,
+        "LEETCODE_DIR": os.path.join(workdir, "problems"),
+        "PROBLEM_CACHE_DIR": os.path.join(workdir, "cache"),
+        "PROBLEM_INDEX_PATH": os.path.join(workdir, "index.db"),
+        "LEETCODE_COOKIE_FILE": os.path.join(workdir, "cookies.json"),
+        # The stub is local, so the request rate limit would only measure the limiter
+        "LEETCODE_RATE": str(args.rate),
+        "LEETCODE_BURST": str(args.rate),
+    }
+    port = free_port()
+    command = [sys.executable, os.path.join(ROOT, "app.py"), "--port", str(port), "--workers", str(args.workers),
+               "--no-debug"]
+    if args.isolate:
+        command.append("--isolate")
+    server = subprocess.Popen(command, cwd=ROOT, env=dict(os.environ, **env),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_server(port, server)
+        # Warm up sessions and cookies so the measured requests reflect steady state
+        drive(port, targets, min(len(targets), args.requests), 1, True)
+        fetches_before = fetch_count(get_metrics_text(port))
+        cpu_before, _ = process_usage(server.pid)
+        latencies, statuses, elapsed = drive(port, targets, args.requests, args.concurrency, not args.cached)
+        cpu_after, peak_rss_kb = process_usage(server.pid)
+        metrics_text = get_metrics_text(port)
+        fetches = fetch_count(metrics_text) - fetches_before
+        stages = stage_metrics(metrics_text)
+    finally:
+        server.terminate()
+        server.wait()
+
+    for stage, peak_kb in profile_stages(targets, env).items():
+        stages.setdefault(stage, {})["peak_kb"] = peak_kb
+    stub.shutdown()
+
+    cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "problems": len(urls), "requests": args.requests, "concurrency": args.concurrency,
+            "workers": args.workers, "isolate": args.isolate, "backend": args.backend,
+            "file_type": args.file_type, "refresh": not args.cached, "latency_ms": args.latency,
+        },
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "requests_per_second": len(latencies) / elapsed,
+        # Requests that joined an in-flight fetch of the same problem and language did no work of their own
+        "fetches": fetches,
+        "joined_requests": len(latencies) - fetches,
+        "fetches_per_second": fetches / elapsed,
+        "latency_ms": {
+            "mean": statistics.mean(latencies) * 1000,
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p90": percentile(latencies, 0.90) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": max(latencies) * 1000,
+        },
+        "server": {
+            "cpu_seconds": cpu,
+            "cpu_ms_per_request": cpu / len(latencies) * 1000 if cpu is not None else None,
+            "cpu_ms_per_fetch": cpu / fetches * 1000 if cpu is not None and fetches else None,
+            "peak_rss_kb": peak_rss_kb,
+        },
+        "stages": stages,
+    }
+
+def print_report(report):
+    latency = report["latency_ms"]
+    print(f"{report['config']['requests']} requests at concurrency {report['config']['concurrency']}: "
+          f"{report['requests_per_second']:.1f} req/s, statuses {report['statuses']}")
+    print(f"Fetches run: {report['fetches']} ({report['fetches_per_second']:.1f}/s); "
+          f"{report['joined_requests']} requests joined an in-flight fetch")
+    print(f"Latency ms: p50 {latency['p50']:.2f}  p90 {latency['p90']:.2f}  p99 {latency['p99']:.2f}  "
+          f"max {latency['max']:.2f}")
+    server = report["server"]
+    if server["cpu_seconds"] is not None:
+        per_fetch = f", {server['cpu_ms_per_fetch']:.2f} ms per fetch" if server["cpu_ms_per_fetch"] else ""
+        print(f"Server: {server['cpu_ms_per_request']:.2f} ms CPU per request{per_fetch}, "
+              f"peak RSS {server['peak_rss_kb']} KB")
+    print(f"\n{'stage':<12} {'count':>7} {'wall ms':>10} {'cpu ms':>10} {'peak KB':>10}")
+    for stage, values in report["stages"].items():
+        cells = [f"{values[key]:>10.3f}" if key in values else f"{'-':>10}" for key in ("wall_ms", "cpu_ms", "peak_kb")]
+        print(f"{stage:<12} {values.get('count', '-'):>7} {' '.join(cells)}")
+
+def flatten(report, prefix=""):
+    values = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f"{prefix}{key}"] = value
+    return values
+
+def compare(report, baseline):
+    """
+    Print the relative change of every figure against a previous report.
+    """
+    current, previous = flatten(report), flatten(baseline)
+    print(f"\nChange against baseline from {baseline.get('timestamp', 'unknown')}:")
+    for key in sorted(current):
+        if key.startswith(("config.", "statuses.")) or key.endswith(".count") or not previous.get(key):
+            continue
+        change = (current[key] - previous[key]) / previous[key] * 100
+        print(f"  {key:<40} {previous[key]:>12.3f} -> {current[key]:>12.3f}  ({change:+.1f}%)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark of the fetch server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Record problems into the corpus (needs network access)")
+    record_parser.add_argument("urls", nargs="*")
+    record_parser.add_argument("--urls-file", help="File with one problem URL per line")
+    record_parser.add_argument("--pages", default=PAGES_DIR)
+    run_parser = commands.add_parser("run", help="Benchmark app.py against the recorded corpus")
+    run_parser.add_argument("--pages", default=PAGES_DIR)
+    run_parser.add_argument("--requests", type=int, default=200)
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--workers", type=int, default=4, help="app.py fetch workers")
+    run_parser.add_argument("--isolate", action="store_true", help="Run app.py with --isolate")
+    run_parser.add_argument("--backend", choices=["auto", "graphql", "html"], default="auto")
+    run_parser.add_argument("--file-type", choices=["py", "cpp", "both"], default="both",
+                            help="Language of the generated files; 'both' alternates to double the distinct fetches")
+    run_parser.add_argument("--cached", action="store_true", help="Serve fetches from the problem cache")
+    run_parser.add_argument("--latency", type=float, default=0.0, help="Delay added by the stub server, in ms")
+    run_parser.add_argument("--rate", type=float, default=10000, help="LEETCODE_RATE for the server")
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results")
+    run_parser.add_argument("--compare", help="Previous results to compare with")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        urls = list(args.urls)
+        if args.urls_file:
+            with open(args.urls_file) as file:
+                urls += [line.strip() for line in file if line.strip() and not line.startswith("#")]
+        record(urls, args.pages)
+        sys.exit(0)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    report = run(args)
+    print_report(report)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+    print(f"\nResults saved in {args.output}.")
+    if baseline:
+        compare(report, baseline)
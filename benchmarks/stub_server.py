@@ -0,0 +1,106 @@
+"""
+Local stand-in for leetcode.com that serves recorded responses, so fetches can be run and
+measured without network access.
+
+Usage: python benchmarks/stub_server.py [--port 8123] [--pages DIR] [--latency MS] [--no-graphql]
+
+Then point the fetcher at it:
+    LEETCODE_BASE_URL=http://127.0.0.1:8123 python fetch.py --url https://leetcode.com/problems/two-sum/ --file_type py
+
+Recorded responses live in benchmarks/pages: `<slug>.json` is the body of a GraphQL
+questionData response and `<slug>.html` the problem page. Problems without a recording get
+`{"data": {"question": null}}` from /graphql and a 404 page. The home page sets a csrftoken
+cookie, like leetcode.com does.
+"""
+import os
+import json
+import time
+import hashlib
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    pages_dir = PAGES_DIR
+    latency = 0.0
+    graphql = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type, headers=None):
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def recorded(self, slug, extension):
+        path = os.path.join(self.pages_dir, f"{os.path.basename(slug)}.{extension}")
+        try:
+            with open(path, "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/":
+            self.send_body(200, b"<html><body>stub</body></html>", "text/html; charset=utf-8",
+                           {"Set-Cookie": "csrftoken=stub-csrf-token; Path=/; Max-Age=31536000"})
+            return
+        parts = [part for part in path.split("/") if part]
+        page = self.recorded(parts[1], "html") if len(parts) >= 2 and parts[0] == "problems" else None
+        if page is None:
+            self.send_body(404, b"<html><body>Not found</body></html>", "text/html; charset=utf-8")
+            return
+        etag = '"' + hashlib.sha1(page).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_body(304, b"", "text/html; charset=utf-8", {"ETag": etag})
+            return
+        self.send_body(200, page, "text/html; charset=utf-8", {"ETag": etag})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length)
+        if self.path.split("?")[0] != "/graphql" or not self.graphql:
+            self.send_body(404, b"{}", "application/json")
+            return
+        try:
+            slug = json.loads(payload)["variables"]["titleSlug"]
+        except (ValueError, KeyError, TypeError):
+            self.send_body(400, b'{"errors": [{"message": "Bad request"}]}', "application/json")
+            return
+        body = self.recorded(slug, "json") or b'{"data": {"question": null}}'
+        self.send_body(200, body, "application/json")
+
+def create_server(port=8123, pages_dir=PAGES_DIR, latency_ms=0.0, graphql=True):
+    """
+    Create (but do not start) a threaded stub server. Use port 0 to pick a free port.
+    """
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "pages_dir": pages_dir, "latency": latency_ms / 1000, "graphql": graphql,
+    })
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded LeetCode responses locally.")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--pages", default=PAGES_DIR, help="Directory of recorded responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay added to every response, in ms")
+    parser.add_argument("--no-graphql", action="store_true", help="Answer 404 on /graphql to exercise the page fallback")
+    args = parser.parse_args()
+
+    server = create_server(args.port, args.pages, args.latency, not args.no_graphql)
+    print(f"Serving {args.pages} on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
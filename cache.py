@@ -0,0 +1,128 @@
+import os
+import json
+import gzip
+import time
+import threading
+
+CACHE_DIR = os.environ.get(
+    "PROBLEM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".leetcode_fetcher", "cache")
+)
+CACHE_TTL = float(os.environ.get("PROBLEM_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_BYTES = int(os.environ.get("PROBLEM_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+class ProblemCache:
+    """
+    On-disk cache of fetched problem pages keyed by problem slug.
+
+    Each entry is a gzipped JSON file holding the raw page (as far as extraction read it),
+    the extracted description, the parsed test cases and the ETag/Last-Modified validators.
+    Entries older than the TTL are revalidated with a conditional request, and the
+    least recently used entries are evicted once the cache grows past its size limit.
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+    def entry_path(self, slug):
+        return os.path.join(self.directory, f"{slug}.json.gz")
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def get(self, slug):
+        """
+        Return the cached entry for a slug, or None. Reading an entry marks it as recently used.
+        """
+        path = self.entry_path(slug)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def put(self, slug, entry):
+        """
+        Store an entry atomically and evict old entries if the cache is over its size limit.
+        """
+        entry["fetched_at"] = time.time()
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.entry_path(slug)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+            json.dump(entry, file)
+        os.replace(temp_path, path)
+        self.count("stores")
+        self.evict()
+
+    def touch(self, slug, entry):
+        """
+        Mark a stale entry as fresh again after a successful revalidation.
+        """
+        self.count("revalidated")
+        self.put(slug, entry)
+
+    def evict(self):
+        with self.lock:
+            try:
+                files = [
+                    os.path.join(self.directory, name)
+                    for name in os.listdir(self.directory)
+                    if name.endswith(".json.gz")
+                ]
+            except OSError:
+                return
+            entries = []
+            for path in files:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.stats["evictions"] += 1
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+default_cache = None
+default_cache_lock = threading.Lock()
+
+def get_cache():
+    """
+    Return the process-wide problem cache, creating it on first use.
+    """
+    global default_cache
+    with default_cache_lock:
+        if default_cache is None:
+            default_cache = ProblemCache()
+        return default_cache
@@ -0,0 +1,204 @@
+import re
+import math
+import json
+
+from literals import parse_value
+
+# Line the C++ harness prints after each test case's output: the separator, then the time spent
+# in solution() in ns and the peak memory so far in KB
+CASE_SEPARATOR = "\x1e"
+RECORD_DELIMITER = f"\n{CASE_SEPARATOR}".encode()
+DEFAULT_TOLERANCE = 1e-5
+PREVIEW_LENGTH = 120
+TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|[^\s,\[\]]+')
+
+def preview(value, length=PREVIEW_LENGTH):
+    """
+    Short one-line rendering of a value for reports, so huge outputs are never printed in full.
+    """
+    text = value if isinstance(value, str) else json.dumps(value) if is_json_value(value) else repr(value)
+    text = text.replace("\n", "\\n")
+    return text if len(text) <= length else f"{text[:length]}... ({len(text)} chars)"
+
+def is_json_value(value):
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+def normalize(value):
+    """
+    Turn tuples into lists (recursively) so solutions may return either.
+    """
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    return value
+
+def canonical_key(value):
+    """
+    Sort key that orders values of mixed types deterministically, for order-insensitive matching.
+    """
+    if isinstance(value, list):
+        return (3, [canonical_key(item) for item in value])
+    if isinstance(value, bool):
+        return (1, int(value))
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if value is None:
+        return (0, 0)
+    return (2, str(value))
+
+def sort_unordered(value):
+    if isinstance(value, list):
+        return sorted((sort_unordered(item) for item in value), key=canonical_key)
+    return value
+
+def numbers_equal(actual, expected, tolerance):
+    if isinstance(actual, bool) or isinstance(expected, bool):
+        return actual == expected
+    if isinstance(actual, float) or isinstance(expected, float):
+        return math.isclose(actual, expected, rel_tol=tolerance, abs_tol=tolerance)
+    return actual == expected
+
+def find_difference(actual, expected, tolerance, path=""):
+    """
+    Walk two parsed values together and describe the first place they differ, or return None.
+    """
+    if isinstance(expected, list) and isinstance(actual, list):
+        for idx, (actual_item, expected_item) in enumerate(zip(actual, expected)):
+            difference = find_difference(actual_item, expected_item, tolerance, f"{path}[{idx}]")
+            if difference:
+                return difference
+        if len(actual) != len(expected):
+            return f"{path or 'output'} has length {len(actual)}, expected {len(expected)}"
+        return None
+    if isinstance(actual, (int, float)) and isinstance(expected, (int, float)):
+        if numbers_equal(actual, expected, tolerance):
+            return None
+    elif actual == expected:
+        return None
+    # Strings are quoted so "134" and 134 read differently
+    expected, actual = (json.dumps(value) if isinstance(value, str) else value for value in (expected, actual))
+    return f"{path or 'output'}: expected {preview(expected, 40)}, got {preview(actual, 40)}"
+
+def compare_values(actual, expected, unordered=False, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare two parsed values, optionally ignoring list order, with a tolerance for floats.
+    Returns (passed, short description of the first difference).
+    """
+    actual, expected = normalize(actual), normalize(expected)
+    if unordered:
+        actual, expected = sort_unordered(actual), sort_unordered(expected)
+    difference = find_difference(actual, expected, tolerance)
+    return difference is None, difference
+
+def compare_tokens(actual_text, expected_text, unordered=False, tolerance=DEFAULT_TOLERANCE):
+    """
+    Fallback for printed output that is not a literal (e.g. "0 1" for "[0,1]"): compare the
+    sequences of numbers and words, ignoring brackets, commas and whitespace.
+    """
+    def tokens(text):
+        parsed = []
+        for token in TOKEN_PATTERN.findall(text):
+            try:
+                parsed.append(parse_value(token))
+            except ValueError:
+                parsed.append(token)
+        return parsed
+    return compare_values(tokens(actual_text), tokens(expected_text), unordered, tolerance)
+
+def parse_expected(expected_text):
+    try:
+        return parse_value(expected_text)
+    except ValueError:
+        return expected_text.strip()
+
+def compare_output(actual, expected_text, unordered=False, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare a value returned by a Python solution with the expected output text of a test case.
+    The value is compared as it is, so a returned string only matches an expected string.
+    Returns (passed, diff).
+    """
+    return compare_values(actual, parse_expected(expected_text), unordered, tolerance)
+
+def compare_printed_output(text, expected_text, unordered=False, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare the text a C++ solution printed with the expected output text of a test case.
+    The text is parsed as a literal where possible; an expected string also matches the text
+    printed without quotes, and other output may still match token by token ("1 2" for [1,2]).
+    Returns (passed, diff).
+    """
+    expected = parse_expected(expected_text)
+    text = text.strip()
+    if isinstance(expected, str) and text == expected:
+        return True, None
+    try:
+        actual = parse_value(text)
+    except ValueError:
+        return compare_tokens(text, expected_text, unordered, tolerance)
+    passed, diff = compare_values(actual, expected, unordered, tolerance)
+    if not passed and compare_tokens(text, expected_text, unordered, tolerance)[0]:
+        return True, None
+    return passed, diff
+
+def parse_case_stats(line):
+    """
+    Turn the stats the harness prints after a case's separator into (seconds in solution(), peak KB).
+    Values the harness could not measure are None.
+    """
+    try:
+        solve_ns, peak_kb = (int(value) for value in line.split())
+    except ValueError:
+        return None, None
+    return solve_ns / 1e9, peak_kb if peak_kb >= 0 else None
+
+def iter_case_outputs(stream, chunk_size=64 * 1024):
+    """
+    Split a binary stream of harness output into per-case (text, stats line) pairs as it arrives.
+    Only the output of the case being read is held in memory.
+    """
+    buffer = b""
+    while True:
+        chunk = stream.read1(chunk_size) if hasattr(stream, "read1") else stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(RECORD_DELIMITER, start)
+            if end == -1:
+                break
+            # Wait for the whole stats line
+            line_end = buffer.find(b"\n", end + len(RECORD_DELIMITER))
+            if line_end == -1:
+                break
+            yield (buffer[start:end].decode("utf-8", errors="replace"),
+                   buffer[end + len(RECORD_DELIMITER):line_end].decode("ascii", errors="replace"))
+            start = line_end + 1
+        buffer = buffer[start:]
+    if buffer.strip():
+        # Output after the last separator, e.g. when the binary crashed mid-case
+        yield buffer.decode("utf-8", errors="replace"), ""
+
+def compare_stream(stream, test_cases, unordered=False, tolerance=DEFAULT_TOLERANCE, fail_fast=False):
+    """
+    Compare harness output read incrementally from `stream` with the expected outputs,
+    yielding one result per case as soon as its output is complete. With fail_fast the
+    comparison stops after the first mismatch.
+    """
+    outputs = iter_case_outputs(stream)
+    for idx, case in enumerate(test_cases):
+        output, stats = next(outputs, (None, ""))
+        if output is None:
+            yield {"case": idx + 1, "status": "error", "output": None, "time": None, "peak_kb": None,
+                   "error": "No output for this case", "diff": None}
+            if fail_fast:
+                return
+            continue
+        passed, diff = compare_printed_output(output, case["output"], unordered, tolerance)
+        solve_time, peak_kb = parse_case_stats(stats)
+        yield {"case": idx + 1, "status": "ok" if passed else "wrong", "output": preview(output.strip()),
+               "time": solve_time, "peak_kb": peak_kb, "error": None, "diff": diff}
+        if fail_fast and not passed:
+            return
@@ -0,0 +1,96 @@
+import json
+from html.parser import HTMLParser
+
+class StopParsing(Exception):
+    pass
+
+class ProblemPageParser(HTMLParser):
+    """
+    Incremental parser that only looks for the fields fetch.py needs: the
+    `<meta name="description">` content and, optionally, the `__NEXT_DATA__` JSON.
+
+    No tree is built. Parsing stops as soon as every wanted field has been seen,
+    so the rest of the page never has to be read or tokenized.
+    """
+
+    def __init__(self, want_next_data=False):
+        super().__init__()
+        self.want_next_data = want_next_data
+        self.description = None
+        self.next_data = None
+        self.in_next_data = False
+        self.next_data_parts = []
+
+    def done(self):
+        return self.description is not None and (self.next_data is not None or not self.want_next_data)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta" and self.description is None:
+            attributes = dict(attrs)
+            if attributes.get("name") == "description":
+                self.description = (attributes.get("content") or "").strip()
+        elif tag == "script" and self.want_next_data and dict(attrs).get("id") == "__NEXT_DATA__":
+            self.in_next_data = True
+        if self.done():
+            raise StopParsing
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_data(self, data):
+        if self.in_next_data:
+            self.next_data_parts.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self.in_next_data:
+            self.in_next_data = False
+            try:
+                self.next_data = json.loads("".join(self.next_data_parts))
+            except ValueError:
+                self.next_data = {}
+            self.next_data_parts = []
+            if self.done():
+                raise StopParsing
+
+def extract_problem_fields(chunks, want_next_data=False):
+    """
+    Feed text chunks (e.g. a streamed response body) to the targeted parser until the wanted
+    fields are found. Returns (description, next_data, consumed_text), where consumed_text is the
+    part of the page that had to be read; fields that were not found are None.
+    """
+    parser = ProblemPageParser(want_next_data)
+    consumed = []
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            consumed.append(chunk)
+            parser.feed(chunk)
+        parser.close()
+    except StopParsing:
+        pass
+    return parser.description, parser.next_data, "".join(consumed)
+
+def extract_test_cases(description):
+    """
+    Collect the example inputs and outputs listed in the problem description.
+    """
+    inputs_outputs = []
+    current_input, current_output = None, None
+    for line in description.split("\n"):
+        line = line.strip()
+        if "Input:" in line:
+            current_input = line.split("Input:")[1].strip()
+        elif "Output:" in line:
+            current_output = line.split("Output:")[1].strip()
+        if current_input and current_output:
+            inputs_outputs.append({"input": current_input, "output": current_output})
+            current_input, current_output = None, None
+    return inputs_outputs
+
+def extract_from_html(html, want_next_data=False):
+    """
+    Run the targeted extraction over an already downloaded page.
+    """
+    description, next_data, _ = extract_problem_fields([html], want_next_data)
+    return description, next_data
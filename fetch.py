@@ -1,9 +1,22 @@
 import os
-import cloudscraper
-from bs4 import BeautifulSoup
 import json
 import re
 import argparse
+import sys
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sessions import get_pool, LEETCODE_URL
+from cache import get_cache
+from extract import extract_problem_fields, extract_test_cases
+from literals import infer_signature
+from metrics import StageTimer, stage, get_metrics
+from questions import question_request, parse_question, code_snippets
+from problem_index import get_index, LEETCODE_DIR
+
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+# "auto" uses the GraphQL API and falls back to the problem page, "graphql" and "html" use only one
+FETCH_BACKEND = os.environ.get("FETCH_BACKEND", "auto")
 
 def save_test_cases(problem_folder, test_cases):
     """
@@ -12,161 +25,379 @@ def save_test_cases(problem_folder, test_cases):
     named_path = os.path.join(problem_folder, "test_cases_named.json")
     with open(named_path, "w") as named_file:
         json.dump(test_cases, named_file, indent=4)
-    print(f"Test cases saved in {named_path}.")
-
-def determine_cpp_type(python_type, value):
-    """
-    Map Python types to equivalent C++ types.
-    """
-    if python_type == "int":
-        return "int"
-    elif python_type == "float":
-        return "double"
-    elif python_type == "string":
-        return "string"
-    elif python_type == "bool":
-        return "bool"
-    elif python_type == "list":
-        if all(isinstance(item, int) for item in value):
-            return "vector<int>"
-        elif all(isinstance(item, (int, float)) for item in value):
-            return "vector<double>"
-        elif all(isinstance(item, bool) for item in value):
-            return "vector<bool>"
-        else:
-            return "vector<auto>"
-    elif python_type == "vector of vectors":
-        inner_type = determine_cpp_type("list", value[0])  # Assume homogeneous lists
-        return f"vector<{inner_type}>"
-    else:
-        return "auto"
+    return named_path
+
+def fetch_error(message, kind="exception", **details):
+    """
+    Build the structured result returned when a fetch fails. `kind` classifies the failure
+    for metrics (e.g. "http_status", "parse", "offline_miss").
+    """
+    result = {"status": "error", "error": message, "kind": kind}
+    result.update(details)
+    return result
+
+def problem_slug(problem_url):
+    """
+    Extract the problem slug (e.g. 'two-sum') from a LeetCode problem URL.
+    """
+    match = re.search(r"/problems/([^/?#]+)", problem_url)
+    if match:
+        return match.group(1)
+    return re.sub(r"\W+", "_", problem_url).strip("_")
+
+def folder_title(title):
+    return title.strip().replace(" ", "_").replace(":", "").replace("/", "_")
 
-def parse_input_with_type_and_structure(input_string):
+def extract_problem_title(description):
+    problem_title = "leetcode_problem"
+    if "Can you solve this real interview question?" in description:
+        problem_title = folder_title(description.split("?")[1].split("-")[0])
+    return problem_title
+
+def problem_page_url(problem_url):
     """
-    Parse the input string into a dictionary of variable names and their Python values,
-    determine the type of each variable, and identify structures like 'vector of vectors'.
+    Canonical page URL of a problem on the configured LeetCode host.
     """
-    variables = {}
-    pattern = r'(\w+)\s*=\s*(.+)'
-    matches = re.finditer(pattern, input_string)
-    for match in matches:
-        var, value = match.groups()
+    match = re.search(r"/problems/([^/?#]+)", problem_url)
+    if match:
+        return f"{LEETCODE_URL}/problems/{match.group(1)}/"
+    return problem_url
+
+def timed_download(chunks):
+    """
+    Count the time spent waiting for page chunks as download time, separate from parsing them.
+    """
+    chunks = iter(chunks)
+    while True:
+        with stage("http_fetch"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+def downloaded_size(response, raw):
+    """
+    Bytes read from the network for a streamed response, as sent (compressed) where the
+    underlying stream reports it.
+    """
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return len(raw.encode("utf-8"))
+
+def load_question_data(problem_url, slug):
+    """
+    Fetch a problem through the GraphQL questionData API: a small JSON payload with the
+    example test cases, parameter names and types, and the official code snippets.
+    Returns a problem dict with status "ok", or an error result.
+    """
+    with stage("http_fetch"):
+        response = get_pool().post(
+            f"{LEETCODE_URL}/graphql", question_request(slug),
+            headers={"Referer": problem_page_url(problem_url), "Content-Type": "application/json"},
+        )
+        body = response.content
+        response.close()
+    if response.status_code != 200:
+        return fetch_error(f"questionData request failed. HTTP Status Code: {response.status_code}",
+                           kind="http_status", status_code=response.status_code, downloaded_bytes=len(body))
+    with stage("parse"):
         try:
-            if value.startswith("[") and value.endswith("]"):
-                parsed_value = json.loads(value)
-                if isinstance(parsed_value, list) and all(isinstance(item, list) for item in parsed_value):
-                    value_type = "vector of vectors"
-                else:
-                    value_type = "list"
-            elif value.startswith('"') or value.startswith("'"):
-                parsed_value = value.strip('"').strip("'")
-                value_type = "string"
-            elif value.isdigit():
-                parsed_value = int(value)
-                value_type = "int"
-            elif re.match(r"^\d+\.\d+$", value):
-                parsed_value = float(value)
-                value_type = "float"
-            else:
-                parsed_value = eval(value)
-                value_type = type(parsed_value).__name__
-            variables[var] = (parsed_value, value_type)
+            question = json.loads(body)["data"]["question"]
+        except (ValueError, KeyError, TypeError):
+            return fetch_error("Invalid questionData response.", kind="parse", downloaded_bytes=len(body))
+    if not question:
+        return fetch_error(f"Problem '{slug}' was not found.", kind="not_found", downloaded_bytes=len(body))
+    with stage("extract"):
+        description, inputs_outputs, signature = parse_question(question)
+    return {
+        "status": "ok",
+        "source": "graphql",
+        "slug": slug,
+        "url": problem_url,
+        "etag": None,
+        "last_modified": None,
+        "title": question.get("title"),
+        "description": description,
+        "inputs_outputs": inputs_outputs,
+        "signature": signature,
+        "code_snippets": code_snippets(question),
+        "downloaded_bytes": len(body),
+    }
+
+def load_problem(problem_url, offline=False, refresh=False):
+    """
+    Return the description and test cases of a problem, using the on-disk cache where possible.
+
+    Problems are fetched through the GraphQL API and, if that fails, from the problem page
+    (see FETCH_BACKEND). Fresh cache entries are used as-is; stale page entries are revalidated
+    with ETag/Last-Modified and only re-downloaded when the page has changed. With offline=True
+    no request is made at all.
+    The result has status "ok" and a "cache" key telling how it was served, or status "error".
+    """
+    cache = get_cache()
+    slug = problem_slug(problem_url)
+    with stage("cache"):
+        entry = None if refresh else cache.get(slug)
+
+    if entry and (offline or cache.is_fresh(entry)):
+        cache.count("hits")
+        return {"status": "ok", "cache": "hit", **entry}
+    if offline:
+        cache.count("misses")
+        return fetch_error(f"Problem '{slug}' is not cached and offline mode is enabled.", kind="offline_miss")
+
+    if FETCH_BACKEND != "html":
+        try:
+            problem = load_question_data(problem_url, slug)
         except Exception as e:
-            print(f"Error parsing value for variable '{var}': {e}")
-            raise ValueError(f"Invalid value for variable '{var}'")
-    return variables
+            problem = fetch_error(f"questionData request failed: {e}")
+        if problem["status"] == "ok" and problem["inputs_outputs"]:
+            cache.count("misses")
+            if entry:
+                cache.count("stale")
+            with stage("cache"):
+                cache.put(slug, {key: value for key, value in problem.items()
+                                 if key not in ("status", "downloaded_bytes")})
+            return {"cache": "miss", **problem}
+        if FETCH_BACKEND == "graphql":
+            return problem if problem["status"] != "ok" else fetch_error("No inputs and outputs found.",
+                                                                        kind="no_test_cases")
+    return load_problem_page(problem_url, slug, entry)
 
-def save_problem_and_open(problem_url, file_type):
+def load_problem_page(problem_url, slug, entry):
     """
-    Fetch the LeetCode problem, extract details, and save test cases and solution files.
+    Fetch a problem by reading its page up to the meta description, revalidating a stale
+    cache entry with a conditional request.
     """
+    cache = get_cache()
+
+    # Pooled sessions reuse connections and persisted cookies across problems
+    headers = cache.conditional_headers(entry) if entry else None
+    with stage("http_fetch"):
+        response = get_pool().get(problem_page_url(problem_url), headers=headers, stream=True)
+    if entry and response.status_code == 304:
+        response.close()
+        cache.count("hits")
+        with stage("cache"):
+            cache.touch(slug, entry)
+        return {"status": "ok", "cache": "revalidated", **entry}
+
+    cache.count("misses")
+    if entry:
+        cache.count("stale")
+    if response.status_code != 200:
+        response.close()
+        return fetch_error(f"Failed to fetch the URL. HTTP Status Code: {response.status_code}",
+                           kind="http_status", status_code=response.status_code)
+
+    # Only read the page up to the description instead of parsing the whole document
+    response.encoding = response.encoding or "utf-8"
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Referer": "https://leetcode.com/",
-        }
-        scraper = cloudscraper.create_scraper()
-        scraper.get("https://leetcode.com")  # Ensure cookies are fetched
+        with stage("parse"):
+            description, _, raw = extract_problem_fields(
+                timed_download(response.iter_content(chunk_size=16 * 1024, decode_unicode=True))
+            )
+        downloaded_bytes = downloaded_size(response, raw)
+    finally:
+        response.close()
+    if description is None:
+        return fetch_error("Meta description not found on the page.", kind="parse",
+                           downloaded_bytes=downloaded_bytes)
 
-        response = scraper.get(problem_url, headers=headers)
-        if response.status_code != 200:
-            print(f"Failed to fetch the URL. HTTP Status Code: {response.status_code}")
-            return
+    with stage("extract"):
+        inputs_outputs = extract_test_cases(description)
+    entry = {
+        "source": "html",
+        "slug": slug,
+        "url": problem_url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "raw": raw,
+        "description": description,
+        "inputs_outputs": inputs_outputs,
+    }
+    if entry["inputs_outputs"]:
+        with stage("cache"):
+            cache.put(slug, entry)
+    return {"status": "ok", "cache": "miss", "downloaded_bytes": downloaded_bytes, **entry}
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        meta_description = soup.find("meta", attrs={"name": "description"})
-        if not meta_description:
-            print("Meta description not found on the page.")
-            return
+def generate_solution_template(problem_url, file_type, first_input, signature=None):
+    """
+    Return the starter code of a solution file, or None for an unsupported file type.
+    Parameters come from the API's signature when available, otherwise they are inferred
+    from the first example input.
+    """
+    signature = signature or infer_signature(first_input)
+    if file_type.lower() == "py":
+        python_args = [arg for arg, _, _ in signature]
+        return (
+            f"# {problem_url}\n"
+            "# Return your results for pretests\n\n"
+            f"def solution({', '.join(python_args)}):\n"
+            "    # Write your solution here\n"
+        )
+    elif file_type.lower() == "cpp":
+        # Parameters keep the order of the example input
+        cpp_args = [f"{cpp_type} &{arg}" for arg, _, cpp_type in signature]
+        return (
+            f"// {problem_url}\n"
+            "// NOTE: Print your results for pretests\n\n"
+            "#include <bits/stdc++.h>\nusing namespace std;\n\n"
+            f"void solution({', '.join(cpp_args)}) {{\n"
+            "    // Write your solution here\n"
+            "}\n"
+        )
+    return None
 
-        description = meta_description.get("content", "").strip()
-        problem_title = "leetcode_problem"
-        if "Can you solve this real interview question?" in description:
-            problem_title = description.split("?")[1].split("-")[0].strip().replace(" ", "_").replace(":", "").replace("/", "_")
-
-        inputs_outputs = []
-        current_input, current_output = None, None
-        for line in description.split("\n"):
-            line = line.strip()
-            if "Input:" in line:
-                current_input = line.split("Input:")[1].strip()
-            elif "Output:" in line:
-                current_output = line.split("Output:")[1].strip()
-            if current_input and current_output:
-                inputs_outputs.append({"input": current_input, "output": current_output})
-                current_input, current_output = None, None
-
-        if not inputs_outputs:
-            print("No inputs and outputs found.")
-            return
+def fetch_and_generate(problem_url, file_type, offline=False, refresh=False):
+    problem = load_problem(problem_url, offline=offline, refresh=refresh)
+    if problem["status"] != "ok":
+        return problem
 
-        problem_folder = os.path.join("E:\leetcode", problem_title)
-        os.makedirs(problem_folder, exist_ok=True)
-        save_test_cases(problem_folder, inputs_outputs)
+    if problem.get("title"):
+        problem_title = folder_title(problem["title"])
+    else:
+        problem_title = extract_problem_title(problem["description"])
+    inputs_outputs = problem["inputs_outputs"]
+    if not inputs_outputs:
+        return fetch_error("No inputs and outputs found.", kind="no_test_cases",
+                           downloaded_bytes=problem.get("downloaded_bytes", 0))
+
+    with stage("template"):
+        solution_code = generate_solution_template(problem_url, file_type, inputs_outputs[0]["input"],
+                                                   problem.get("signature"))
+    if solution_code is None:
+        return fetch_error("Invalid file type. Use 'cpp' or 'py'.", kind="invalid_file_type")
 
+    with stage("write"):
+        problem_folder = os.path.join(LEETCODE_DIR, problem_title)
+        os.makedirs(problem_folder, exist_ok=True)
+        test_cases_path = save_test_cases(problem_folder, inputs_outputs)
         solution_file_path = os.path.join(problem_folder, f"solution.{file_type}")
-        first_input = inputs_outputs[0]["input"]
-
-        if file_type.lower() == "py":
-            python_args = []
-            input_pattern = re.findall(r"(\w+)\s*=", first_input)
-            python_args.extend(input_pattern)
-            with open(solution_file_path, "w") as py_file:
-                py_file.write(f"# {problem_url}\n")
-                py_file.write("# Return your results for pretests\n\n")
-                py_file.write(f"def solution({', '.join(python_args)}):\n")
-                py_file.write("    # Write your solution here\n")
-
-        elif file_type.lower() == "cpp":
-            cpp_args = set()
-            for case in inputs_outputs:
-                raw_input = case["input"]
-                parsed_args = parse_input_with_type_and_structure(raw_input)
-                for arg, (value, python_type) in parsed_args.items():
-                    cpp_type = determine_cpp_type(python_type, value)
-                    cpp_args.add(f"{cpp_type} &{arg}")
-            with open(solution_file_path, "w") as cpp_file:
-                cpp_file.write(f"// {problem_url}\n")
-                cpp_file.write("// NOTE: Print your results for pretests\n\n")
-                cpp_file.write("#include <bits/stdc++.h>\nusing namespace std;\n\n")
-                cpp_file.write(f"void solution({', '.join((cpp_args))}) {{\n")
-                cpp_file.write("    // Write your solution here\n")
-                cpp_file.write("}\n")
+        with open(solution_file_path, "w") as solution_file:
+            solution_file.write(solution_code)
 
-        else:
-            print("Invalid file type. Use 'cpp' or 'py'.")
-            return
+    result = {
+        "status": "ok",
+        "problem_url": problem_url,
+        "file_type": file_type,
+        "problem_title": problem_title,
+        "problem_folder": problem_folder,
+        "test_cases_path": test_cases_path,
+        "solution_file_path": solution_file_path,
+        "test_cases": inputs_outputs,
+        "cache": problem["cache"],
+        "source": problem.get("source", "html"),
+        "downloaded_bytes": problem.get("downloaded_bytes", 0),
+    }
+
+    with stage("index"):
+        try:
+            get_index().upsert({
+                "slug": problem_slug(problem_url),
+                "title": problem.get("title") or problem_title.replace("_", " "),
+                "url": problem_url,
+                "folder": os.path.abspath(problem_folder),
+                "languages": [file_type.lower()],
+                "test_cases": inputs_outputs,
+                "signature": problem.get("signature") or infer_signature(inputs_outputs[0]["input"]),
+                "description": problem["description"],
+            })
+        except Exception as e:
+            # The files are written; a failed index update should not fail the fetch
+            result["index_error"] = str(e)
+    return result
+
+def save_problem_and_open(problem_url, file_type, offline=False, refresh=False):
+    """
+    Fetch the LeetCode problem, extract details, and save test cases and solution files.
 
-        print(f"Solution file created: {solution_file_path}")
-        return solution_file_path
+    Returns a dictionary describing the outcome instead of printing it, so the function can be
+    called directly from the server. Successful results have status "ok" and carry the problem
+    title, folder, generated file paths and parsed test cases; failures have status "error".
+    Every result carries the seconds spent in each stage under "timings" (wall time) and
+    "cpu_timings", which are also recorded in the process metrics.
+    Pass offline=True to regenerate the files from the cache only, or refresh=True to bypass it.
+    """
+    with StageTimer() as timer:
+        try:
+            result = fetch_and_generate(problem_url, file_type, offline, refresh)
+        except Exception as e:
+            result = fetch_error(str(e))
+    result["timings"] = timer.timings
+    result["cpu_timings"] = timer.cpu_timings
+    if timer.memory_peaks:
+        result["memory_peaks"] = timer.memory_peaks
+    get_metrics().record_fetch(result)
+    return result
 
-    except Exception as e:
-        print(f"Error: {e}")
+def fetch_many(problem_urls, file_type, concurrency=BATCH_CONCURRENCY, offline=False, refresh=False):
+    """
+    Fetch several problems concurrently and yield each result as soon as it finishes.
+
+    At most `concurrency` problems are in flight at once; requests to leetcode.com are further
+    throttled by the shared rate limiter in sessions.py. Every result carries its problem URL
+    and its position in the input list.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(save_problem_and_open, url, file_type, offline, refresh): (index, url)
+            for index, url in enumerate(problem_urls)
+        }
+        for future in as_completed(futures):
+            index, url = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = fetch_error(str(e))
+            result["problem_url"] = url
+            result["index"] = index
+            yield result
+
+def read_urls_file(urls_file):
+    """
+    Read problem URLs from a file, one per line, ignoring blank lines and '#' comments.
+    """
+    with open(urls_file, "r") as file:
+        return [line.strip() for line in file if line.strip() and not line.strip().startswith("#")]
+
+def print_result(result):
+    """
+    Print a fetch result in the same human-readable form the CLI has always used.
+    """
+    if result["status"] != "ok":
+        print(f"Error: {result['error']}")
+        return
+    print(f"Test cases saved in {result['test_cases_path']}.")
+    print(f"Solution file created: {result['solution_file_path']}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fetch LeetCode problem and create solution file.")
-    parser.add_argument('--url', type=str, required=True, help="LeetCode problem URL")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--url', type=str, help="LeetCode problem URL")
+    source.add_argument('--urls-file', type=str, help="File with one LeetCode problem URL per line")
     parser.add_argument('--file_type', type=str, required=True, choices=['py', 'cpp'], help="Programming language type")
+    parser.add_argument('--json', action='store_true', help="Print the result as JSON instead of text")
+    parser.add_argument('--offline', action='store_true', help="Only use the problem cache, never the network")
+    parser.add_argument('--refresh', action='store_true', help="Ignore the problem cache and download the page again")
+    parser.add_argument('--concurrency', type=int, default=BATCH_CONCURRENCY, help="Problems fetched at once with --urls-file")
     args = parser.parse_args()
 
-    save_problem_and_open(args.url, args.file_type)
+    if args.urls_file:
+        results = fetch_many(read_urls_file(args.urls_file), args.file_type, args.concurrency,
+                             offline=args.offline, refresh=args.refresh)
+    else:
+        results = [save_problem_and_open(args.url, args.file_type, offline=args.offline, refresh=args.refresh)]
+
+    failed = False
+    for result in results:
+        if args.json:
+            print(json.dumps(result), flush=True)
+        else:
+            if args.urls_file:
+                print(f"[{result['problem_url']}]")
+            print_result(result)
+        failed = failed or result["status"] != "ok"
+    if failed:
+        sys.exit(1)
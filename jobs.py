@@ -0,0 +1,105 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+JOB_TTL = float(os.environ.get("JOB_TTL", "600"))
+MAX_JOBS = int(os.environ.get("MAX_JOBS", "1000"))
+
+class Job:
+    """
+    A fetch running on the worker pool, identified by a random id.
+    """
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.future = None
+
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+class JobStore:
+    """
+    Bounded in-memory registry of fetch jobs with single-flight de-duplication.
+
+    Submitting a job whose key matches one that is still queued or running returns the existing
+    job instead of starting another, so repeated requests for the same problem share one fetch.
+    Finished jobs are kept for `ttl` seconds, and at most `max_jobs` of them are retained.
+    """
+
+    def __init__(self, ttl=JOB_TTL, max_jobs=MAX_JOBS):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self.inflight = {}
+        self.lock = threading.Lock()
+
+    def submit(self, key, executor, fn, *args):
+        """
+        Run fn(*args) on the executor under the given key, or join the in-flight job for that key.
+        """
+        with self.lock:
+            self.prune()
+            job = self.inflight.get(key)
+            if job is not None:
+                return job
+            job = Job(key)
+            self.jobs[job.id] = job
+            self.inflight[key] = job
+            job.future = executor.submit(self.run, job, fn, *args)
+            return job
+
+    def run(self, job, fn, *args):
+        job.status = "running"
+        status, result, error = "failed", None, None
+        try:
+            result = fn(*args)
+            if result.get("status") == "ok":
+                status = "done"
+            return result
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            with self.lock:
+                job.result = result
+                job.error = error
+                job.finished_at = time.time()
+                job.status = status
+                if self.inflight.get(job.key) is job:
+                    del self.inflight[job.key]
+
+    def get(self, job_id):
+        with self.lock:
+            self.prune()
+            return self.jobs.get(job_id)
+
+    def prune(self):
+        """
+        Drop expired finished jobs and the oldest finished jobs beyond the size limit.
+        Must be called with the lock held.
+        """
+        now = time.time()
+        finished = [job for job in self.jobs.values() if job.finished()]
+        excess = len(finished) - self.max_jobs
+        for job in finished:
+            if excess > 0 or now - job.finished_at > self.ttl:
+                del self.jobs[job.id]
+                excess -= 1
@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# test.py shares its name with the standard library's test package. Python puts this folder first
+# on sys.path, except under -P, -I or PYTHONSAFEPATH, where `import test` would find the stdlib one
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compare import preview, DEFAULT_TOLERANCE
+from problem_index import LEETCODE_DIR
+from run_history import RUN_HISTORY
+from test import (prepare_cpp_solution, run_cpp_cases, run_python_cases, get_python_pool, build_precompiled_header,
+                  profile_flags, cpp_memory_limit, history_cases, record_history, BUILD_PROFILES, DEFAULT_PROFILE,
+                  CASE_TIMEOUT, CASE_MEMORY_MB, SOLUTION_FILES)
+
+JUDGE_JOBS = int(os.environ.get("JUDGE_JOBS", "0")) or os.cpu_count() or 1
+
+def discover_solutions(root, languages=("py", "cpp"), pattern=None):
+    """
+    Find every solution file under root that has a test_cases_named.json next to it,
+    optionally only in folders whose path contains `pattern`.
+    """
+    solutions = []
+    for folder, subfolders, files in os.walk(root):
+        subfolders[:] = sorted(name for name in subfolders if not name.startswith("."))
+        if "test_cases_named.json" not in files or (pattern and pattern.lower() not in folder.lower()):
+            continue
+        for name in SOLUTION_FILES:
+            if name in files and name.rsplit(".", 1)[1] in languages:
+                solutions.append(os.path.join(folder, name))
+    return solutions
+
+@contextmanager
+def redirected_output(file):
+    """
+    Point this process's stdout and stderr file descriptors at `file`, so the output of
+    subprocesses such as the compiler is redirected too.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = (os.dup(1), os.dup(2))
+    os.dup2(file.fileno(), 1)
+    os.dup2(file.fileno(), 2)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        os.close(saved[0])
+        os.close(saved[1])
+
+@contextmanager
+def captured_output(log):
+    """
+    Append everything written to stdout and stderr inside the block to the list `log`.
+    Judge workers run one solution at a time, so this only captures that solution's output.
+    """
+    with tempfile.TemporaryFile() as file:
+        try:
+            with redirected_output(file):
+                yield
+        finally:
+            file.seek(0)
+            log.append(file.read().decode("utf-8", errors="replace").strip())
+
+def start_worker(timeout, memory_mb):
+    """
+    Start the judge worker's Python test process up front with its output going to devnull,
+    so it does not inherit the descriptors of a captured solution and prints from solutions
+    never reach the terminal.
+    """
+    with open(os.devnull, "wb") as devnull, redirected_output(devnull):
+        get_python_pool(1, timeout, memory_mb).start()
+
+def judge_solution(solution_file_path, profile, timeout, memory_mb, unordered, tolerance, fail_fast, history):
+    """
+    Build (for C++) and run one solution against its test cases in this worker process,
+    and with `history` record the run in the run history.
+    Returns a summary with the status "passed", "failed" or "error" (the solution could not be
+    read or built), the per-case results, and the build and run times in seconds.
+    """
+    language = solution_file_path.rsplit(".", 1)[1]
+    test_cases_path = os.path.join(os.path.dirname(solution_file_path), "test_cases_named.json")
+    summary = {"solution": solution_file_path, "language": language, "status": "error", "passed": 0,
+               "total": 0, "build_time": None, "run_time": None, "cases": [], "log": ""}
+    log = []
+    results = None
+    with captured_output(log):
+        try:
+            with open(test_cases_path, "r") as file:
+                test_cases = json.load(file)
+            if language == "cpp":
+                start = time.perf_counter()
+                prepared = prepare_cpp_solution(solution_file_path, profile)
+                summary["build_time"] = time.perf_counter() - start
+                if prepared:
+                    start = time.perf_counter()
+                    results = run_cpp_cases(prepared, unordered, tolerance, fail_fast, timeout,
+                                            cpp_memory_limit(profile, memory_mb))
+            else:
+                start = time.perf_counter()
+                results = run_python_cases(solution_file_path, test_cases, get_python_pool(1, timeout, memory_mb),
+                                           unordered, tolerance, fail_fast)
+            if results is not None:
+                summary["run_time"] = time.perf_counter() - start
+                if history:
+                    record_history(solution_file_path, "test", history_cases(results), profile)
+        except Exception as e:
+            print(f"Error judging solution: {type(e).__name__}: {e}")
+    summary["log"] = log[0]
+    if results is None:
+        return summary
+
+    for idx, (result, case) in enumerate(zip(results, test_cases), start=1):
+        summary["cases"].append({
+            "case": idx,
+            "status": result["status"],
+            "time": result.get("time"),
+            "output": result.get("output"),
+            "expected": preview(case["output"]),
+            "error": result.get("error"),
+            "diff": result.get("diff"),
+        })
+    summary["total"] = len(results)
+    summary["passed"] = sum(result["status"] == "ok" for result in results)
+    summary["status"] = "passed" if summary["passed"] == summary["total"] else "failed"
+    return summary
+
+def judge(root, jobs=JUDGE_JOBS, languages=("py", "cpp"), pattern=None, profile=DEFAULT_PROFILE,
+          timeout=CASE_TIMEOUT, memory_mb=CASE_MEMORY_MB, unordered=False, tolerance=DEFAULT_TOLERANCE,
+          fail_fast=False, history=RUN_HISTORY):
+    """
+    Judge every solution under root on a pool of `jobs` worker processes, each building and
+    running one solution at a time, and print one line per solution as it finishes.
+    C++ solutions are queued first since building them takes longest. Returns the summaries
+    in path order and the elapsed wall time.
+    """
+    solutions = discover_solutions(root, languages, pattern)
+    solutions.sort(key=lambda path: (not path.endswith(".cpp"), path))
+    if any(path.endswith(".cpp") for path in solutions):
+        # Build the shared precompiled header once, before the workers would all race to build it
+        build_precompiled_header(profile_flags(profile))
+
+    print(f"Judging {len(solutions)} solutions under {root} with {jobs} workers...\n")
+    start = time.perf_counter()
+    summaries = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=start_worker, initargs=(timeout, memory_mb)) as executor:
+        futures = [
+            executor.submit(judge_solution, path, profile, timeout, memory_mb, unordered, tolerance, fail_fast,
+                            history)
+            for path in solutions
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            summary = future.result()
+            summaries.append(summary)
+            print(f"[{done}/{len(solutions)}] {summary['status'].upper():<6} "
+                  f"{os.path.relpath(summary['solution'], root)} ({summary['passed']}/{summary['total']})")
+    summaries.sort(key=lambda summary: summary["solution"])
+    return summaries, time.perf_counter() - start
+
+def print_summary(summaries, root, elapsed, jobs):
+    """
+    Print a table of every solution's result and the totals.
+    """
+    def milliseconds(seconds, width):
+        return f"{seconds * 1000:>{width}.0f}" if seconds is not None else f"{'-':>{width}}"
+
+    width = max([len("Problem")] + [len(os.path.relpath(os.path.dirname(s["solution"]), root)) for s in summaries])
+    print(f"\n{'Problem':<{width}}  {'Lang':<4}  {'Result':<6}  {'Cases':>7}  {'Build ms':>9}  {'Run ms':>8}")
+    for summary in summaries:
+        problem = os.path.relpath(os.path.dirname(summary["solution"]), root)
+        cases = f"{summary['passed']}/{summary['total']}"
+        print(f"{problem:<{width}}  {summary['language']:<4}  {summary['status']:<6}  {cases:>7}  "
+              f"{milliseconds(summary['build_time'], 9)}  {milliseconds(summary['run_time'], 8)}")
+
+    counts = {status: sum(s["status"] == status for s in summaries) for status in ("passed", "failed", "error")}
+    print(f"\n{len(summaries)} solutions: {counts['passed']} passed, {counts['failed']} failed, "
+          f"{counts['error']} errors in {elapsed:.1f}s on {jobs} workers.")
+    for summary in summaries:
+        if summary["status"] == "error" and summary["log"]:
+            print(f"\n{os.path.relpath(summary['solution'], root)}:\n{summary['log'][-2000:]}")
+
+def write_json_report(path, summaries, root, elapsed, jobs):
+    report = {"root": os.path.abspath(root), "timestamp": time.time(), "elapsed": elapsed, "jobs": jobs,
+              "solutions": summaries}
+    with open(path, "w") as file:
+        json.dump(report, file, indent=4)
+
+def write_junit_report(path, summaries, root, elapsed):
+    """
+    Write a JUnit XML report with one test suite per solution and one test case per case.
+    A solution that could not be built or read is reported as a single errored "build" case.
+    """
+    suites = ET.Element("testsuites", name="leetcode-judge", time=f"{elapsed:.3f}")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    for summary in summaries:
+        name = os.path.relpath(summary["solution"], root).replace(os.sep, "/")
+        classname = name.rsplit(".", 1)[0].replace("/", ".") + "." + summary["language"]
+        run_time = (summary["build_time"] or 0) + (summary["run_time"] or 0)
+        suite = ET.SubElement(suites, "testsuite", name=name, time=f"{run_time:.3f}")
+        counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+        if summary["status"] == "error":
+            testcase = ET.SubElement(suite, "testcase", name="build", classname=classname)
+            ET.SubElement(testcase, "error", message="Could not build or load the solution").text = summary["log"]
+            counts["tests"], counts["errors"] = 1, 1
+        for case in summary["cases"]:
+            testcase = ET.SubElement(suite, "testcase", name=f"case {case['case']}", classname=classname,
+                                     time=f"{case['time'] or 0:.3f}")
+            counts["tests"] += 1
+            if case["status"] == "wrong":
+                failure = ET.SubElement(testcase, "failure", message=case["diff"] or "Wrong answer")
+                failure.text = f"Output:   {case['output']}\nExpected: {case['expected']}"
+                counts["failures"] += 1
+            elif case["status"] == "skipped":
+                ET.SubElement(testcase, "skipped", message=case["error"] or "")
+                counts["skipped"] += 1
+            elif case["status"] != "ok":
+                ET.SubElement(testcase, "error", message=case["error"] or case["status"])
+                counts["errors"] += 1
+        for key, value in counts.items():
+            suite.set(key, str(value))
+            totals[key] += value
+    for key, value in totals.items():
+        suites.set(key, str(value))
+    ET.ElementTree(suites).write(path, encoding="utf-8", xml_declaration=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every solution under a folder of problems against its test cases.")
+    parser.add_argument('root', nargs='?', default=LEETCODE_DIR, help="Folder of problem folders (default LEETCODE_DIR)")
+    parser.add_argument('--jobs', '-j', type=int, default=JUDGE_JOBS, help="Solutions judged in parallel")
+    parser.add_argument('--language', choices=["py", "cpp"], action='append',
+                        help="Only judge solutions in this language (repeatable)")
+    parser.add_argument('--filter', help="Only judge problems whose folder path contains this text")
+    parser.add_argument('--profile', choices=sorted(BUILD_PROFILES), default=DEFAULT_PROFILE, help="C++ build profile")
+    parser.add_argument('--timeout', type=float, default=CASE_TIMEOUT, help="Time limit per test case in seconds")
+    parser.add_argument('--memory', type=int, default=CASE_MEMORY_MB, help="Memory limit per run in MB (0 for none)")
+    parser.add_argument('--unordered', action='store_true', help="Ignore the order of list elements in outputs")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Absolute and relative tolerance for comparing floats")
+    parser.add_argument('--fail-fast', action='store_true', help="Stop each solution at its first failing case")
+    parser.add_argument('--no-history', dest='history', action='store_false', default=RUN_HISTORY,
+                        help="Do not record the runs in the run history")
+    parser.add_argument('--json', dest='json_path', help="Write a JSON report to this file")
+    parser.add_argument('--junit', dest='junit_path', help="Write a JUnit XML report to this file")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f"Error: {args.root} is not a directory")
+        sys.exit(1)
+    summaries, elapsed = judge(args.root, args.jobs, tuple(args.language or ("py", "cpp")), args.filter,
+                               args.profile, args.timeout, args.memory, args.unordered, args.tolerance,
+                               args.fail_fast, args.history)
+    print_summary(summaries, args.root, elapsed, args.jobs)
+    if args.json_path:
+        write_json_report(args.json_path, summaries, args.root, elapsed, args.jobs)
+        print(f"JSON report saved in {args.json_path}.")
+    if args.junit_path:
+        write_junit_report(args.junit_path, summaries, args.root, elapsed)
+        print(f"JUnit report saved in {args.junit_path}.")
+    sys.exit(0 if all(summary["status"] == "passed" for summary in summaries) else 1)
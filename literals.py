@@ -0,0 +1,160 @@
+import re
+import json
+
+decoder = json.JSONDecoder()
+NAME_PATTERN = re.compile(r"\s*([A-Za-z_]\w*)\s*=\s*")
+NUMBER_PATTERN = re.compile(r"-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?")
+SEPARATOR_PATTERN = re.compile(r"\s*(?:,\s*)?")
+WORD_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+
+def skip_whitespace(text, pos):
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+def parse_literal(text, pos=0):
+    """
+    Parse one literal starting at `pos` and return (value, end position).
+
+    JSON literals (numbers, double-quoted strings, true/false/null and nested arrays) are
+    decoded by the C-accelerated JSON scanner in a single call. Python-style literals
+    (single-quoted strings, True/False/None) fall back to a small recursive scanner.
+    """
+    pos = skip_whitespace(text, pos)
+    if pos >= len(text):
+        raise ValueError("Expected a value but reached the end of the input")
+    try:
+        return decoder.raw_decode(text, pos)
+    except ValueError:
+        pass
+
+    char = text[pos]
+    if char == "[":
+        items = []
+        pos = skip_whitespace(text, pos + 1)
+        if pos < len(text) and text[pos] == "]":
+            return items, pos + 1
+        while True:
+            item, pos = parse_literal(text, pos)
+            items.append(item)
+            pos = skip_whitespace(text, pos)
+            if pos < len(text) and text[pos] == ",":
+                pos += 1
+            elif pos < len(text) and text[pos] == "]":
+                return items, pos + 1
+            else:
+                raise ValueError(f"Expected ',' or ']' at position {pos}")
+    if char in "'\"":
+        end = pos + 1
+        chars = []
+        while end < len(text) and text[end] != char:
+            if text[end] == "\\" and end + 1 < len(text):
+                end += 1
+            chars.append(text[end])
+            end += 1
+        if end >= len(text):
+            raise ValueError(f"Unterminated string starting at position {pos}")
+        return "".join(chars), end + 1
+    number = NUMBER_PATTERN.match(text, pos)
+    if number:
+        literal = number.group()
+        is_float = any(mark in literal for mark in ".eE")
+        return (float(literal) if is_float else int(literal)), number.end()
+    word = re.compile(r"[A-Za-z_]\w*").match(text, pos)
+    if word and word.group() in WORD_LITERALS:
+        return WORD_LITERALS[word.group()], word.end()
+    raise ValueError(f"Unexpected character {char!r} at position {pos}")
+
+def parse_value(text):
+    """
+    Parse a complete literal, such as an expected output.
+    """
+    value, end = parse_literal(text)
+    if skip_whitespace(text, end) != len(text):
+        raise ValueError(f"Unexpected trailing text at position {end}")
+    return value
+
+def parse_assignments(input_string):
+    """
+    Parse "name = value, name = value" into a dictionary in a single pass.
+    Commas and '=' inside strings and arrays are handled correctly.
+    """
+    variables = {}
+    pos = 0
+    length = len(input_string)
+    while skip_whitespace(input_string, pos) < length:
+        match = NAME_PATTERN.match(input_string, pos)
+        if not match:
+            raise ValueError(f"Expected 'name = value' at position {pos}")
+        name = match.group(1)
+        try:
+            variables[name], pos = parse_literal(input_string, match.end())
+        except ValueError as e:
+            raise ValueError(f"Invalid value for variable '{name}': {e}")
+        pos = SEPARATOR_PATTERN.match(input_string, pos).end()
+    return variables
+
+def value_type(value):
+    """
+    Name the structure of a parsed value the way the template and harness generators expect.
+    """
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        if value and all(isinstance(item, list) for item in value):
+            return "vector of vectors"
+        return "list"
+    return type(value).__name__
+
+def parse_input_with_type_and_structure(input_string):
+    """
+    Parse the input string into a dictionary of variable names and their Python values,
+    determine the type of each variable, and identify structures like 'vector of vectors'.
+    """
+    return {name: (value, value_type(value)) for name, value in parse_assignments(input_string).items()}
+
+def determine_cpp_type(python_type, value):
+    """
+    Map Python types to equivalent C++ types.
+    """
+    if python_type == "int":
+        return "int" if -2 ** 31 <= value < 2 ** 31 else "long long"
+    elif python_type == "float":
+        return "double"
+    elif python_type == "string":
+        return "string"
+    elif python_type == "bool":
+        return "bool"
+    elif python_type == "list":
+        if value and all(isinstance(item, bool) for item in value):
+            return "vector<bool>"
+        elif all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+            if all(-2 ** 31 <= item < 2 ** 31 for item in value):
+                return "vector<int>"
+            return "vector<long long>"
+        elif all(isinstance(item, (int, float)) for item in value):
+            return "vector<double>"
+        elif all(isinstance(item, str) for item in value):
+            return "vector<string>"
+        else:
+            return "vector<auto>"
+    elif python_type == "vector of vectors":
+        items = [item for row in value for item in row]
+        return f"vector<{determine_cpp_type('list', items)}>"
+    else:
+        return "auto"
+
+def infer_signature(input_string):
+    """
+    Return the (name, python type, C++ type) of every parameter in a test case input, in order.
+    """
+    return [
+        (name, python_type, determine_cpp_type(python_type, value))
+        for name, (value, python_type) in parse_input_with_type_and_structure(input_string).items()
+    ]
@@ -0,0 +1,235 @@
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+JSON_LOGS = os.environ.get("FETCH_JSON_LOGS", "0") == "1"
+# Record the peak traced memory of every stage while tracemalloc is running (single-threaded use only)
+TRACE_MEMORY = os.environ.get("FETCH_TRACE_MEMORY", "0") == "1"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Stages of a fetch, in pipeline order
+FETCH_STAGES = ("cache", "warmup", "http_fetch", "parse", "extract", "template", "write", "index")
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+class Counter:
+    """
+    Monotonic counter with optional labels, e.g. counter.inc(kind="timeout").
+    """
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(key)} {value}")
+        return lines
+
+class Histogram:
+    """
+    Histogram with fixed bucket bounds and optional labels, rendered with cumulative
+    buckets as Prometheus expects.
+    """
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.series.setdefault(key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][idx] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, series in sorted(self.series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{format_labels(key + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{self.name}_bucket{format_labels(key + (('le', '+Inf'),))} {series['count']}")
+                lines.append(f"{self.name}_sum{format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{format_labels(key)} {series['count']}")
+        return lines
+
+class MetricsRegistry:
+    """
+    The metrics of one process, exposed by the server on /metrics.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.http_requests = self.add(Counter(
+            "leetcode_http_requests_total", "HTTP requests served, by endpoint and status code."))
+        self.http_duration = self.add(Histogram(
+            "leetcode_http_request_duration_seconds", "Time spent serving HTTP requests, by endpoint."))
+        self.fetches = self.add(Counter(
+            "leetcode_fetches_total", "Problem fetches, by status and how the cache served them."))
+        self.errors = self.add(Counter(
+            "leetcode_fetch_errors_total", "Failed fetches and requests, by kind of error."))
+        self.fetch_duration = self.add(Histogram(
+            "leetcode_fetch_duration_seconds", "Total time of a problem fetch."))
+        self.stage_duration = self.add(Histogram(
+            "leetcode_fetch_stage_seconds", "Time spent in each stage of a problem fetch."))
+        self.stage_cpu = self.add(Histogram(
+            "leetcode_fetch_stage_cpu_seconds", "CPU time of the fetching thread in each stage of a problem fetch."))
+        self.downloaded_bytes = self.add(Counter(
+            "leetcode_downloaded_bytes_total", "Bytes of problem pages downloaded from leetcode.com."))
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def record_fetch(self, result):
+        """
+        Record a finished fetch from its result: status, error kind, stage timings and bytes downloaded.
+        Works the same for in-process fetches and results returned by an isolated fetch.py.
+        """
+        self.fetches.inc(status=result.get("status", "error"), cache=result.get("cache", "none"))
+        if result.get("status") != "ok":
+            self.errors.inc(kind=result.get("kind", "unknown"))
+        timings = result.get("timings") or {}
+        for stage, seconds in timings.items():
+            if stage != "total":
+                self.stage_duration.observe(seconds, stage=stage)
+        if "total" in timings:
+            self.fetch_duration.observe(timings["total"])
+        for stage, seconds in (result.get("cpu_timings") or {}).items():
+            if stage != "total":
+                self.stage_cpu.observe(seconds, stage=stage)
+        if result.get("downloaded_bytes"):
+            self.downloaded_bytes.inc(result["downloaded_bytes"])
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+class StageTimer:
+    """
+    Measures how long a fetch spends in each stage, in wall time and in CPU time of the thread.
+
+    Stages may nest; a stage's time excludes the stages nested inside it, so the stage
+    timings add up to the total. While the timer is active on a thread, stage() calls made
+    anywhere on that thread (e.g. the session warmup in sessions.py) are attributed to it.
+    With TRACE_MEMORY set and tracemalloc running, the peak memory allocated above the
+    stage's starting point is recorded too, including nested stages.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.cpu_timings = {}
+        self.memory_peaks = {}
+        self.stack = []
+        self.start = None
+        self.trace_memory = TRACE_MEMORY and tracemalloc.is_tracing()
+
+    def __enter__(self):
+        self.start = (time.perf_counter(), time.thread_time())
+        current.timer = self
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings["total"] = time.perf_counter() - self.start[0]
+        self.cpu_timings["total"] = time.thread_time() - self.start[1]
+        current.timer = None
+        return False
+
+    def memory_checkpoint(self):
+        """
+        Fold the peak since the last checkpoint into every open stage, then reset the peak.
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self.stack:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            self.memory_checkpoint()
+        frame = {"wall": 0.0, "cpu": 0.0, "base": tracemalloc.get_traced_memory()[0] if self.trace_memory else 0,
+                 "peak": 0}
+        started = (time.perf_counter(), time.thread_time())
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            if self.trace_memory:
+                self.memory_checkpoint()
+            self.stack.pop()
+            wall = time.perf_counter() - started[0]
+            cpu = time.thread_time() - started[1]
+            self.timings[name] = self.timings.get(name, 0.0) + wall - frame["wall"]
+            self.cpu_timings[name] = self.cpu_timings.get(name, 0.0) + cpu - frame["cpu"]
+            if self.trace_memory:
+                peak = max(frame["peak"] - frame["base"], 0)
+                self.memory_peaks[name] = max(self.memory_peaks.get(name, 0), peak)
+            if self.stack:
+                self.stack[-1]["wall"] += wall
+                self.stack[-1]["cpu"] += cpu
+
+current = threading.local()
+
+@contextmanager
+def stage(name):
+    """
+    Time a stage of the fetch running on this thread; does nothing outside a StageTimer.
+    """
+    timer = getattr(current, "timer", None)
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+def log_event(event, **fields):
+    """
+    Write one structured JSON log line to stderr when FETCH_JSON_LOGS is enabled.
+    """
+    if not JSON_LOGS:
+        return
+    record = {"time": round(time.time(), 3), "event": event}
+    record.update(fields)
+    sys.stderr.write(json.dumps(record, default=str) + "\n")
+    sys.stderr.flush()
+
+registry = MetricsRegistry()
+
+def get_metrics():
+    """
+    Return the process-wide metrics registry.
+    """
+    return registry
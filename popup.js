@@ -11,7 +11,8 @@ document.getElementById('fetchButton').addEventListener('click', function() {
           // Define the request payload
           const requestData = {
               problem_url: currentTabUrl,  // Automatically use the current URL
-              file_type: selectedLanguage  // Use the selected language (py/cpp)
+              file_type: selectedLanguage,  // Use the selected language (py/cpp)
+              async: true  // Get a job id back instead of waiting for the fetch
           };
 
           // Send the data to your Flask server
@@ -24,8 +25,8 @@ document.getElementById('fetchButton').addEventListener('click', function() {
           })
           .then(response => response.json())
           .then(data => {
-              if (data.message === "Success") {
-                  alert('Problem fetched successfully!');
+              if (data.job_id) {
+                  pollJob(data.job_id);
               } else {
                   alert('An error occurred: ' + data.error);
               }
@@ -39,3 +40,22 @@ document.getElementById('fetchButton').addEventListener('click', function() {
       }
   });
 });
+
+// Poll the fetch job until it finishes
+function pollJob(jobId) {
+  fetch('http://127.0.0.1:5000/jobs/' + jobId)
+  .then(response => response.json())
+  .then(job => {
+      if (job.status === 'queued' || job.status === 'running') {
+          setTimeout(() => pollJob(jobId), 1000);
+      } else if (job.status === 'done') {
+          alert('Problem fetched successfully!');
+      } else {
+          alert('An error occurred: ' + (job.error || (job.result && job.result.error) || 'Unknown job'));
+      }
+  })
+  .catch(error => {
+      console.error('Error:', error);
+      alert('Error occurred while checking the fetch status.');
+  });
+}
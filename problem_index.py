@@ -0,0 +1,295 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+
+from literals import infer_signature
+from cache import get_cache
+
+# Folder the problem folders are written to
+LEETCODE_DIR = os.environ.get(
+    "LEETCODE_DIR", "E:\\leetcode" if os.name == "nt" else os.path.join(os.path.expanduser("~"), "leetcode")
+)
+INDEX_PATH = os.environ.get(
+    "PROBLEM_INDEX_PATH", os.path.join(os.path.expanduser("~"), ".leetcode_fetcher", "index.db")
+)
+SOLUTION_LANGUAGES = ("py", "cpp")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    slug TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT,
+    folder TEXT,
+    languages TEXT NOT NULL DEFAULT '[]',
+    fetched_at REAL NOT NULL,
+    test_cases TEXT NOT NULL DEFAULT '[]',
+    signature TEXT,
+    description TEXT NOT NULL DEFAULT ''
+);
+"""
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS problems_fts USING fts5(title, description);
+"""
+
+class ProblemIndex:
+    """
+    SQLite index of fetched problems keyed by slug.
+
+    Each row holds the title, URL, folder, generated languages, fetch time, parsed test cases
+    and inferred signature. Titles and descriptions are also kept in an FTS5 table for
+    full-text search (a LIKE search is used where SQLite lacks FTS5). Lookups by slug use
+    the primary key, so "already fetched?" checks do not depend on the number of problems.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            try:
+                self.conn.executescript(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                self.fts = False
+
+    def upsert(self, record):
+        """
+        Insert or update a problem. Languages are merged with the ones already indexed,
+        and fields missing from the record keep their indexed values.
+        """
+        with self.lock, self.conn:
+            self.write(record)
+
+    def upsert_many(self, records):
+        """
+        Index many problems in a single transaction.
+        """
+        with self.lock, self.conn:
+            for record in records:
+                self.write(record)
+
+    def write(self, record):
+        existing = self.conn.execute("SELECT * FROM problems WHERE slug = ?", (record["slug"],)).fetchone()
+        existing = self.row_to_dict(existing) if existing else {}
+        languages = sorted(set(existing.get("languages", [])) | set(record.get("languages", [])))
+        row = {
+            "slug": record["slug"],
+            "title": record.get("title") or existing.get("title") or record["slug"],
+            "url": record.get("url") or existing.get("url"),
+            "folder": record.get("folder") or existing.get("folder"),
+            "languages": json.dumps(languages),
+            "fetched_at": record.get("fetched_at") or time.time(),
+            "test_cases": json.dumps(record.get("test_cases") or existing.get("test_cases") or []),
+            "signature": json.dumps(record.get("signature") or existing.get("signature")),
+            "description": record.get("description") or existing.get("description") or "",
+        }
+        # Upsert in place so the row keeps its rowid, which is also the key of its FTS row
+        rowid = self.conn.execute(
+            "INSERT INTO problems (slug, title, url, folder, languages, fetched_at, test_cases, signature, "
+            "description) VALUES (:slug, :title, :url, :folder, :languages, :fetched_at, :test_cases, "
+            ":signature, :description) ON CONFLICT(slug) DO UPDATE SET title = excluded.title, "
+            "url = excluded.url, folder = excluded.folder, languages = excluded.languages, "
+            "fetched_at = excluded.fetched_at, test_cases = excluded.test_cases, "
+            "signature = excluded.signature, description = excluded.description RETURNING rowid",
+            row,
+        ).fetchone()[0]
+        if self.fts:
+            self.conn.execute("DELETE FROM problems_fts WHERE rowid = ?", (rowid,))
+            self.conn.execute("INSERT INTO problems_fts (rowid, title, description) VALUES (?, ?, ?)",
+                              (rowid, row["title"], row["description"]))
+
+    def row_to_dict(self, row):
+        record = dict(row)
+        record["languages"] = json.loads(record["languages"])
+        record["test_cases"] = json.loads(record["test_cases"])
+        record["signature"] = json.loads(record["signature"]) if record["signature"] else None
+        return record
+
+    def get(self, slug):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM problems WHERE slug = ?", (slug,)).fetchone()
+        return self.row_to_dict(row) if row else None
+
+    def contains(self, slug, language=None):
+        """
+        Whether a problem has been fetched, optionally in a given language.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT languages FROM problems WHERE slug = ?", (slug,)).fetchone()
+        return row is not None and (language is None or language in json.loads(row["languages"]))
+
+    def search(self, query, limit=20):
+        """
+        Full-text search over titles and descriptions, best matches first. Every word of the
+        query must match, as a prefix ("bin sea" finds "Binary Search").
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return self.list(limit)
+        columns = "p.slug, p.title, p.url, p.folder, p.languages, p.fetched_at"
+        with self.lock:
+            if self.fts:
+                match = " ".join(f'"{word}"*' for word in words)
+                rows = self.conn.execute(
+                    f"SELECT {columns} FROM problems_fts f JOIN problems p ON p.rowid = f.rowid "
+                    "WHERE problems_fts MATCH ? ORDER BY bm25(problems_fts, 10.0, 1.0) LIMIT ?",
+                    (match, limit),
+                ).fetchall()
+            else:
+                conditions = " AND ".join("(p.title LIKE ? OR p.description LIKE ?)" for _ in words)
+                params = [f"%{word}%" for word in words for _ in range(2)]
+                rows = self.conn.execute(
+                    f"SELECT {columns} FROM problems p WHERE {conditions} ORDER BY p.title LIMIT ?",
+                    params + [limit],
+                ).fetchall()
+        return [self.summary(row) for row in rows]
+
+    def list(self, limit=20):
+        """
+        The most recently fetched problems.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT slug, title, url, folder, languages, fetched_at FROM problems "
+                "ORDER BY fetched_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self.summary(row) for row in rows]
+
+    def summary(self, row):
+        record = dict(row)
+        record["languages"] = json.loads(record["languages"])
+        return record
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM problems").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def read_folder(folder, cache=None):
+    """
+    Build an index record from a problem folder written by fetch.py, or None if the folder
+    has no test cases. The URL is read from the comment on the first line of a solution file,
+    and the description from the problem cache when it is given and has the problem.
+    """
+    test_cases_path = os.path.join(folder, "test_cases_named.json")
+    try:
+        with open(test_cases_path, "r") as file:
+            test_cases = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    url, languages = None, []
+    for language in SOLUTION_LANGUAGES:
+        solution_path = os.path.join(folder, f"solution.{language}")
+        if not os.path.exists(solution_path):
+            continue
+        languages.append(language)
+        with open(solution_path, "r", errors="replace") as file:
+            match = re.search(r"https?://\S+/problems/[^/\s]+", file.readline())
+        url = url or (match.group() + "/" if match else None)
+
+    match = re.search(r"/problems/([^/?#]+)", url or "")
+    slug = match.group(1) if match else os.path.basename(folder).lower().replace("_", "-")
+    entry = cache.get(slug) if cache else None
+    signature = None
+    if test_cases:
+        try:
+            signature = infer_signature(test_cases[0]["input"])
+        except (ValueError, KeyError):
+            pass
+    return {
+        "slug": slug,
+        "title": (entry or {}).get("title") or os.path.basename(folder).replace("_", " "),
+        "url": url,
+        "folder": os.path.abspath(folder),
+        "languages": languages,
+        "fetched_at": os.path.getmtime(test_cases_path),
+        "test_cases": test_cases,
+        "signature": (entry or {}).get("signature") or signature,
+        "description": (entry or {}).get("description") or "",
+    }
+
+def import_folders(root, index, cache=None):
+    """
+    Rebuild the index from the problem folders under root. Returns the number of problems indexed.
+    """
+    records = []
+    for name in sorted(os.listdir(root)):
+        folder = os.path.join(root, name)
+        if os.path.isdir(folder):
+            record = read_folder(folder, cache)
+            if record:
+                records.append(record)
+    index.upsert_many(records)
+    return len(records)
+
+default_index = None
+default_index_lock = threading.Lock()
+
+def get_index():
+    """
+    Return the process-wide problem index, creating it on first use.
+    """
+    global default_index
+    with default_index_lock:
+        if default_index is None:
+            default_index = ProblemIndex()
+        return default_index
+
+def print_summaries(records):
+    if not records:
+        print("No problems found.")
+        return
+    for record in records:
+        fetched = time.strftime("%Y-%m-%d", time.localtime(record["fetched_at"]))
+        print(f"{record['slug']:<40} {record['title']:<40} {','.join(record['languages']):<7} {fetched}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query or rebuild the local index of fetched problems.")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search_parser = commands.add_parser("search", help="Full-text search over titles and descriptions")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=20)
+    list_parser = commands.add_parser("list", help="Most recently fetched problems")
+    list_parser.add_argument("--limit", type=int, default=20)
+    show_parser = commands.add_parser("show", help="Everything indexed about one problem")
+    show_parser.add_argument("slug")
+    import_parser = commands.add_parser("import", help="Index the problem folders under a directory")
+    import_parser.add_argument("root", nargs="?", default=None, help="Defaults to LEETCODE_DIR")
+    args = parser.parse_args()
+
+    index = get_index()
+    if args.command == "import":
+        root = args.root or LEETCODE_DIR
+        if not os.path.isdir(root):
+            print(f"Error: {root} is not a directory")
+            sys.exit(1)
+        count = import_folders(root, index, get_cache())
+        print(f"Indexed {count} problems from {root}.")
+    elif args.command == "show":
+        record = index.get(args.slug)
+        if record is None:
+            print(f"Error: {args.slug} is not in the index")
+            sys.exit(1)
+        print(json.dumps(record, indent=4))
+    else:
+        records = index.search(args.query, args.limit) if args.command == "search" else index.list(args.limit)
+        if args.json:
+            print(json.dumps(records, indent=4))
+        else:
+            print_summaries(records)
@@ -0,0 +1,112 @@
+import re
+import json
+import html
+
+from literals import parse_value, value_type, determine_cpp_type
+from extract import extract_test_cases
+
+# Only the fields needed to generate the files; the response is a few KB instead of a full page
+QUESTION_QUERY = """
+query questionData($titleSlug: String!) {
+  question(titleSlug: $titleSlug) {
+    questionFrontendId
+    title
+    titleSlug
+    content
+    exampleTestcases
+    sampleTestCase
+    metaData
+    codeSnippets {
+      langSlug
+      code
+    }
+  }
+}
+"""
+
+# LeetCode parameter types that map directly to a C++ type the test harness can read
+METADATA_CPP_TYPES = {
+    "integer": "int",
+    "long": "long long",
+    "double": "double",
+    "boolean": "bool",
+    "string": "string",
+    "character": "char",
+}
+SNIPPET_LANGUAGES = ("python3", "cpp")
+
+def question_request(slug):
+    return {"operationName": "questionData", "query": QUESTION_QUERY, "variables": {"titleSlug": slug}}
+
+def cpp_type_from_metadata(type_name):
+    """
+    Translate a metaData parameter type such as "integer[][]" or "list<string>" to its C++ type,
+    or None for types the harness cannot read (e.g. ListNode, TreeNode).
+    """
+    type_name = type_name.strip()
+    if type_name.endswith("[]"):
+        inner = cpp_type_from_metadata(type_name[:-2])
+        return f"vector<{inner}>" if inner else None
+    match = re.fullmatch(r"list<(.+)>", type_name)
+    if match:
+        inner = cpp_type_from_metadata(match.group(1))
+        return f"vector<{inner}>" if inner else None
+    return METADATA_CPP_TYPES.get(type_name)
+
+def content_text(content):
+    """
+    Turn the question's HTML content into plain text with one "Input: ..." / "Output: ..." per line.
+    """
+    text = re.sub(r"<br\s*/?>|</p>|</pre>|</li>", "\n", content or "")
+    text = re.sub(r"<[^>]+>", "", text)
+    return html.unescape(text).replace("\xa0", " ")
+
+def parse_question(question):
+    """
+    Build the problem fields from a questionData payload.
+
+    Inputs come from exampleTestcases (one line per parameter, named from metaData) and
+    expected outputs from the examples in the content. When the two do not line up, for
+    example for design problems without "params", the Input:/Output: pairs in the content
+    are used as they are. Returns (description, test cases, signature or None).
+    """
+    description = content_text(question.get("content"))
+    content_cases = extract_test_cases(description)
+    try:
+        metadata = json.loads(question.get("metaData") or "{}")
+    except ValueError:
+        metadata = {}
+    params = metadata.get("params") or []
+    lines = [line for line in (question.get("exampleTestcases") or "").split("\n") if line.strip()]
+
+    if not params or len(lines) % len(params) or len(lines) // len(params) != len(content_cases):
+        return description, content_cases, None
+
+    test_cases = []
+    for idx, case in enumerate(content_cases):
+        values = lines[idx * len(params):(idx + 1) * len(params)]
+        test_cases.append({
+            "input": ", ".join(f"{param['name']} = {value.strip()}" for param, value in zip(params, values)),
+            "output": case["output"],
+        })
+
+    signature = []
+    for idx, param in enumerate(params):
+        try:
+            value = parse_value(lines[idx])
+        except ValueError:
+            return description, content_cases, None
+        python_type = value_type(value)
+        cpp_type = cpp_type_from_metadata(param.get("type", "")) or determine_cpp_type(python_type, value)
+        signature.append((param["name"], python_type, cpp_type))
+    return description, test_cases, signature
+
+def code_snippets(question):
+    """
+    Keep the official starter code for the languages files are generated for.
+    """
+    return {
+        snippet["langSlug"]: snippet["code"]
+        for snippet in question.get("codeSnippets") or []
+        if snippet.get("langSlug") in SNIPPET_LANGUAGES
+    }
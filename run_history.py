@@ -0,0 +1,379 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import sqlite3
+import argparse
+import statistics
+import threading
+
+HISTORY_PATH = os.environ.get(
+    "RUN_HISTORY_PATH", os.path.join(os.path.expanduser("~"), ".leetcode_fetcher", "history.db")
+)
+RUN_HISTORY = os.environ.get("RUN_HISTORY", "1") != "0"
+# A case is flagged when it is significantly slower at this level and slower by at least the threshold
+DEFAULT_ALPHA = 0.05
+DEFAULT_THRESHOLD = 0.05
+MIN_SAMPLES = 3
+# Smallest change of a case's median time that can count as slower or faster, however significant
+MIN_DELTA_NS = float(os.environ.get("RUN_HISTORY_MIN_DELTA_NS", "2000"))
+# Earlier runs whose medians give the run-to-run noise of every case
+NOISE_RUNS = int(os.environ.get("RUN_HISTORY_NOISE_RUNS", "10"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL,
+    language TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    flags TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    passed INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    total_ms REAL,
+    cases TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_problem ON runs (slug, language, id);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (slug, language, mode, flags, total_ms);
+"""
+
+def solution_slug(solution_file_path):
+    """
+    The problem slug of a solution file, from the problem URL on its first line
+    (written by fetch.py), or else from its folder name.
+    """
+    try:
+        with open(solution_file_path, "r", errors="replace") as file:
+            match = re.search(r"/problems/([^/?#\s]+)", file.readline())
+    except OSError:
+        match = None
+    if match:
+        return match.group(1)
+    folder = os.path.basename(os.path.dirname(os.path.abspath(solution_file_path)))
+    return folder.lower().replace("_", "-")
+
+class RunHistory:
+    """
+    Append-only SQLite store of test and benchmark runs.
+
+    Every run is one row: the problem slug and language, a hash of the solution's content,
+    the compiler flags (or Python version), the mode ("test" or "bench"), and the per-case
+    status, timings in ms and peak memory as JSON, plus the run's total time when every case
+    passed. Recording a run is a single INSERT, and the latest and fastest runs of a problem
+    are found through indexes, so queries stay fast with thousands of runs. Several processes
+    may record at once.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+
+    def record(self, solution_file_path, language, content_hash, flags, mode, cases, slug=None):
+        """
+        Append a run. `cases` holds one dict per test case with its "case" number, "status",
+        "times_ms" (every timed run of the case) and "peak_kb". Returns the run id.
+        """
+        passed = sum(case["status"] == "ok" for case in cases)
+        total_ms = run_time({"cases": cases, "passed": passed, "total": len(cases)})
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (slug, language, solution, content_hash, flags, mode, started_at, passed, total, "
+                "total_ms, cases) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (slug or solution_slug(solution_file_path), language, os.path.abspath(solution_file_path),
+                 content_hash, flags, mode, time.time(), passed, len(cases), total_ms, json.dumps(cases)),
+            )
+        return cursor.lastrowid
+
+    def row_to_dict(self, row):
+        run = dict(row)
+        run["cases"] = json.loads(run["cases"])
+        return run
+
+    def get(self, run_id):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return self.row_to_dict(row) if row else None
+
+    def runs(self, slug, language, limit=20):
+        """
+        The most recent runs of a problem in one language.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM runs WHERE slug = ? AND language = ? ORDER BY id DESC LIMIT ?", (slug, language, limit)
+            ).fetchall()
+        return [self.row_to_dict(row) for row in rows]
+
+    def find(self, slug, language, mode=None, flags=None, before=None, fastest=False):
+        """
+        The latest run of a problem (or with fastest, the one with the lowest total time),
+        optionally only of one mode and flags and only before a run id.
+        """
+        runs = self.find_all(slug, language, mode, flags, before, fastest, limit=1)
+        return runs[0] if runs else None
+
+    def find_all(self, slug, language, mode=None, flags=None, before=None, fastest=False, limit=NOISE_RUNS):
+        """
+        Like find(), but up to `limit` runs, latest (or fastest) first.
+        """
+        query = "SELECT * FROM runs WHERE slug = ? AND language = ?"
+        params = [slug, language]
+        for column, value in (("mode", mode), ("flags", flags)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        if before is not None:
+            query += " AND id < ?"
+            params.append(before)
+        query += " AND total_ms IS NOT NULL ORDER BY total_ms LIMIT ?" if fastest else " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self.row_to_dict(row) for row in rows]
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def case_median(case):
+    return statistics.median(case["times_ms"]) if case.get("times_ms") else None
+
+def run_time(run):
+    """
+    Sum of the median case times of a run where every case passed, or None if a case failed
+    or has no timing.
+    """
+    medians = [case_median(case) for case in run["cases"]]
+    if not medians or any(median is None for median in medians) or run["passed"] != run["total"]:
+        return None
+    return sum(medians)
+
+def slower_p_value(current, previous):
+    """
+    One-sided Mann-Whitney U test (normal approximation with tie correction): the probability
+    of current samples at least this much larger than the previous ones if both came from the
+    same distribution. Needs no assumption about the shape of the timing distribution.
+    """
+    n1, n2 = len(current), len(previous)
+    ordered = sorted([(value, 0) for value in current] + [(value, 1) for value in previous])
+    ranks, ties, idx = [0.0] * len(ordered), 0.0, 0
+    while idx < len(ordered):
+        end = idx
+        while end + 1 < len(ordered) and ordered[end + 1][0] == ordered[idx][0]:
+            end += 1
+        for position in range(idx, end + 1):
+            ranks[position] = (idx + end) / 2 + 1
+        count = end - idx + 1
+        ties += count ** 3 - count
+        idx = end + 1
+    u = sum(rank for rank, (_, group) in zip(ranks, ordered) if group == 0) - n1 * (n1 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def case_noise(earlier, case_number):
+    """
+    Run-to-run noise of one case: the largest spread (max - min) of its median times among
+    earlier runs of the same code (same content hash), or None when no solution was timed twice.
+    """
+    medians = {}
+    for run in earlier:
+        case = next((case for case in run["cases"] if case["case"] == case_number), None)
+        median = case_median(case) if case is not None else None
+        if median is not None:
+            medians.setdefault(run["content_hash"], []).append(median)
+    spreads = [max(values) - min(values) for values in medians.values() if len(values) >= 2]
+    return max(spreads) if spreads else None
+
+def compare_runs(current, previous, alpha=DEFAULT_ALPHA, threshold=DEFAULT_THRESHOLD, min_delta_ns=MIN_DELTA_NS,
+                 earlier=()):
+    """
+    Compare every case of two runs. A case is "slower" when its median time grew by more than
+    `threshold`, by more than `min_delta_ns` and by more than its noise across the `earlier` runs
+    (see case_noise()), and the growth is significant at `alpha`; "faster" for the opposite, and
+    "same" otherwise. Cases with fewer than MIN_SAMPLES timings in either run can only be
+    "slower?" or "faster?" (not enough samples to tell noise from a change). Peak memory growth
+    beyond the threshold is reported as "more memory".
+    """
+    previous_cases = {case["case"]: case for case in previous["cases"]}
+    rows = []
+    for case in current["cases"]:
+        before = previous_cases.get(case["case"])
+        row = {"case": case["case"], "current_ms": case_median(case), "previous_ms": None, "change": None,
+               "noise_ms": None, "p_value": None, "verdict": "n/a", "current_kb": case.get("peak_kb"),
+               "previous_kb": None}
+        rows.append(row)
+        if before is None:
+            continue
+        row["previous_ms"], row["previous_kb"] = case_median(before), before.get("peak_kb")
+        if row["current_ms"] is None or not row["previous_ms"]:
+            continue
+        row["change"] = row["current_ms"] / row["previous_ms"] - 1
+        row["noise_ms"] = case_noise(earlier, case["case"])
+        enough = min(len(case["times_ms"]), len(before["times_ms"])) >= MIN_SAMPLES
+        delta_ms = abs(row["current_ms"] - row["previous_ms"])
+        if delta_ms <= max(min_delta_ns / 1e6, row["noise_ms"] or 0):
+            row["verdict"] = "same"
+        elif row["change"] > threshold:
+            if not enough:
+                row["verdict"] = "slower?"
+            else:
+                row["p_value"] = slower_p_value(case["times_ms"], before["times_ms"])
+                row["verdict"] = "slower" if row["p_value"] < alpha else "same"
+        elif row["change"] < -threshold:
+            if not enough:
+                row["verdict"] = "faster?"
+            else:
+                row["p_value"] = slower_p_value(before["times_ms"], case["times_ms"])
+                row["verdict"] = "faster" if row["p_value"] < alpha else "same"
+        else:
+            row["verdict"] = "same"
+        if row["current_kb"] and row["previous_kb"] and row["current_kb"] > row["previous_kb"] * (1 + threshold):
+            row["verdict"] += ", more memory"
+    return rows
+
+def baselines(history, run, any_flags=False):
+    """
+    The best (fastest fully passing) and the most recent earlier runs to compare a run with:
+    same problem, language and mode, and by default the same flags. Also returns the NOISE_RUNS
+    most recent earlier runs and the best one, to estimate the run-to-run noise from.
+    """
+    flags = None if any_flags else run["flags"]
+    best = history.find(run["slug"], run["language"], run["mode"], flags, run["id"], fastest=True)
+    earlier = history.find_all(run["slug"], run["language"], run["mode"], flags, run["id"])
+    latest = earlier[0] if earlier else None
+    if best is not None and all(previous["id"] != best["id"] for previous in earlier):
+        earlier.append(best)
+    return best, latest, earlier
+
+def describe_run(run):
+    started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started_at"]))
+    timing = f", {run['total_ms']:.3f} ms" if run["total_ms"] is not None else ""
+    return f"run {run['id']} ({started}, {run['content_hash'][:8]}, {run['passed']}/{run['total']} passed{timing})"
+
+def print_comparison(history, run, alpha=DEFAULT_ALPHA, threshold=DEFAULT_THRESHOLD, any_flags=False,
+                     min_delta_ns=MIN_DELTA_NS):
+    """
+    Print how a run compares with the best and the most recent earlier runs.
+    Returns True if any case got significantly slower.
+    """
+    def cell(value, width, spec=".3f"):
+        return f"{value:>{width}{spec}}" if value is not None else f"{'-':>{width}}"
+
+    print(f"\n{run['slug']} ({run['language']}, {run['mode']}): {describe_run(run)}")
+    best, latest, earlier = baselines(history, run, any_flags)
+    if best is None and latest is None:
+        print("No earlier runs to compare with.")
+        return False
+    regressed = False
+    for label, previous in (("best", best), ("most recent", latest)):
+        if previous is None or (label == "most recent" and best is not None and previous["id"] == best["id"]):
+            continue
+        name = "best and most recent" if best is not None and latest is not None and best["id"] == latest["id"] \
+            else label
+        print(f"\nAgainst the {name} {describe_run(previous)}:")
+        print(f"{'Case':>4}  {'Now ms':>9}  {'Then ms':>9}  {'Change':>8}  {'Noise ms':>9}  {'p':>6}  {'Now KB':>9}  "
+              f"{'Then KB':>9}  Verdict")
+        for row in compare_runs(run, previous, alpha, threshold, min_delta_ns, earlier):
+            change = f"{row['change'] * 100:>+7.1f}%" if row["change"] is not None else f"{'-':>8}"
+            print(f"{row['case']:>4}  {cell(row['current_ms'], 9)}  {cell(row['previous_ms'], 9)}  {change}  "
+                  f"{cell(row['noise_ms'], 9)}  {cell(row['p_value'], 6, '.3f')}  {cell(row['current_kb'], 9, '.0f')}  "
+                  f"{cell(row['previous_kb'], 9, '.0f')}  {row['verdict']}")
+            regressed = regressed or row["verdict"].split(",")[0] == "slower"
+    return regressed
+
+default_history = None
+default_history_lock = threading.Lock()
+
+def get_history():
+    """
+    Return the process-wide run history, creating it on first use.
+    """
+    global default_history
+    with default_history_lock:
+        if default_history is None:
+            default_history = RunHistory()
+        return default_history
+
+def resolve_target(target, language=None):
+    """
+    Turn a solution file path or a problem slug into (slug, languages to look at).
+    """
+    if os.path.isfile(target):
+        return solution_slug(target), [language or target.rsplit(".", 1)[-1].lower()]
+    return target, [language] if language else ["py", "cpp"]
+
+def print_runs(runs):
+    if not runs:
+        print("No runs recorded.")
+        return
+    print(f"{'Run':>6}  {'Started':<19}  {'Hash':<8}  {'Mode':<5}  {'Passed':>7}  {'Total ms':>9}  Flags")
+    for run in runs:
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started_at"]))
+        total = f"{run['total_ms']:>9.3f}" if run["total_ms"] is not None else f"{'-':>9}"
+        print(f"{run['id']:>6}  {started:<19}  {run['content_hash'][:8]:<8}  {run['mode']:<5}  "
+              f"{run['passed']:>3}/{run['total']:<3}  {total}  {run['flags']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the history of test and benchmark runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="Recent runs of a problem")
+    compare_parser = commands.add_parser("compare", help="Compare a run with the best and most recent earlier runs")
+    for command_parser in (list_parser, compare_parser):
+        command_parser.add_argument("target", help="Solution file or problem slug")
+        command_parser.add_argument("--language", choices=["py", "cpp"])
+    list_parser.add_argument("--limit", type=int, default=20)
+    compare_parser.add_argument("--run", type=int, help="Run to compare (default: the latest)")
+    compare_parser.add_argument("--mode", choices=["test", "bench"], help="Compare the latest run of this mode")
+    compare_parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Smallest relative change reported as slower or faster")
+    compare_parser.add_argument("--min-delta-ns", type=float, default=MIN_DELTA_NS,
+                                help="Smallest absolute change of a case's median reported as slower or faster")
+    compare_parser.add_argument("--any-flags", action="store_true", help="Also compare with runs built with other flags")
+    args = parser.parse_args()
+
+    history = get_history()
+    if args.command == "compare" and args.run:
+        run = history.get(args.run)
+        if run is None:
+            print(f"Error: there is no run {args.run}")
+            sys.exit(1)
+        sys.exit(1 if print_comparison(history, run, args.alpha, args.threshold, args.any_flags, args.min_delta_ns)
+                 else 0)
+
+    slug, languages = resolve_target(args.target, args.language)
+    regressed = False
+    for language in languages:
+        if args.command == "list":
+            runs = history.runs(slug, language, args.limit)
+            if runs or len(languages) == 1:
+                print(f"{slug} ({language}):")
+                print_runs(runs)
+            continue
+        run = history.find(slug, language, args.mode)
+        if run:
+            regressed = print_comparison(history, run, args.alpha, args.threshold, args.any_flags,
+                                         args.min_delta_ns) or regressed
+        elif len(languages) == 1:
+            print(f"No runs of {slug} ({language}) recorded.")
+    sys.exit(1 if regressed else 0)
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import queue
+import random
+import threading
+from urllib.parse import urlsplit
+import cloudscraper
+
+from metrics import stage
+
+# Point LEETCODE_BASE_URL at a local stub server to fetch recorded responses instead of leetcode.com
+LEETCODE_URL = os.environ.get("LEETCODE_BASE_URL", "https://leetcode.com").rstrip("/")
+LEETCODE_HOST = urlsplit(LEETCODE_URL).hostname or "leetcode.com"
+COOKIE_FILE = os.environ.get(
+    "LEETCODE_COOKIE_FILE", os.path.join(os.path.expanduser("~"), ".leetcode_fetcher", "cookies.json")
+)
+POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", "4"))
+RATE_LIMIT = float(os.environ.get("LEETCODE_RATE", "2"))
+RATE_BURST = int(os.environ.get("LEETCODE_BURST", "4"))
+MAX_RETRIES = int(os.environ.get("LEETCODE_MAX_RETRIES", "4"))
+RETRY_BACKOFF = float(os.environ.get("LEETCODE_RETRY_BACKOFF", "1.0"))
+RETRY_STATUSES = (429, 503)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Referer": f"{LEETCODE_URL}/",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+def is_challenge(response):
+    """
+    Detect a Cloudflare challenge page instead of the requested content.
+    """
+    if response.headers.get("cf-mitigated") == "challenge":
+        return True
+    if response.status_code in (403, 503):
+        body = response.text[:4096]
+        return "Just a moment" in body or "cf-chl" in body or "challenge-platform" in body
+    return False
+
+def has_valid_cookies(jar):
+    """
+    Check whether the jar still holds unexpired LeetCode cookies, so the warmup request can be skipped.
+    """
+    jar.clear_expired_cookies()
+    return any(cookie.name == "csrftoken" and cookie.domain.endswith(LEETCODE_HOST) for cookie in jar)
+
+def csrf_token(jar):
+    for cookie in jar:
+        if cookie.name == "csrftoken":
+            return cookie.value
+    return None
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` requests per second with bursts of up to `burst`.
+    """
+
+    def __init__(self, rate=RATE_LIMIT, burst=RATE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available and consume it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def retry_delay(response, attempt):
+    """
+    Seconds to wait before retrying a throttled request: the server's Retry-After when given,
+    otherwise exponential backoff with jitter.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return RETRY_BACKOFF * (2 ** attempt) * (0.5 + random.random() / 2)
+
+class ScraperPool:
+    """
+    A small pool of long-lived cloudscraper sessions.
+
+    Sessions keep their HTTP connections alive between problems, request compressed
+    responses and share cookies persisted on disk, so the Cloudflare challenge and the
+    cookie warmup request are only repeated when the cookies expire or a challenge is served.
+    """
+
+    def __init__(self, size=POOL_SIZE, cookie_file=COOKIE_FILE):
+        self.size = size
+        self.cookie_file = cookie_file
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+        self.cookie_lock = threading.Lock()
+        self.limiters = {}
+        self.limiters_lock = threading.Lock()
+
+    def create_session(self):
+        scraper = cloudscraper.create_scraper()
+        scraper.headers.update(DEFAULT_HEADERS)
+        self.load_cookies(scraper)
+        leetcode_session = os.environ.get("LEETCODE_SESSION")
+        if leetcode_session:
+            scraper.cookies.set("LEETCODE_SESSION", leetcode_session, domain=f".{LEETCODE_HOST}")
+        return scraper
+
+    def acquire(self):
+        """
+        Take an idle session, creating a new one while the pool is below its size,
+        and otherwise wait for another caller to release one.
+        """
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.created < self.size:
+                self.created += 1
+                return self.create_session()
+        return self.idle.get()
+
+    def release(self, scraper):
+        self.idle.put(scraper)
+
+    def limiter(self, url):
+        host = urlsplit(url).hostname or ""
+        with self.limiters_lock:
+            if host not in self.limiters:
+                self.limiters[host] = TokenBucket()
+            return self.limiters[host]
+
+    def request(self, scraper, url, headers=None, stream=False, method="GET", json_body=None):
+        """
+        Send a rate-limited request, retrying with backoff while the server answers 429 or 503.
+        Challenge pages are returned as-is so the caller can refresh cookies.
+        """
+        limiter = self.limiter(url)
+        for attempt in range(MAX_RETRIES + 1):
+            limiter.acquire()
+            response = scraper.request(method, url, headers=headers, stream=stream, json=json_body)
+            if response.status_code not in RETRY_STATUSES or is_challenge(response) or attempt == MAX_RETRIES:
+                return response
+            response.close()
+            time.sleep(retry_delay(response, attempt))
+
+    def warm_up(self, scraper):
+        """
+        Visit the LeetCode home page to obtain fresh cookies and store them on disk.
+        """
+        with stage("warmup"):
+            self.request(scraper, LEETCODE_URL)
+            self.save_cookies(scraper)
+
+    def load_cookies(self, scraper):
+        try:
+            with open(self.cookie_file, "r") as file:
+                cookies = json.load(file)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for cookie in cookies:
+            if cookie.get("expires") and cookie["expires"] < now:
+                continue
+            scraper.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie["domain"], path=cookie["path"], expires=cookie.get("expires"),
+            )
+
+    def save_cookies(self, scraper):
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+            }
+            for cookie in scraper.cookies
+        ]
+        with self.cookie_lock:
+            os.makedirs(os.path.dirname(self.cookie_file), exist_ok=True)
+            temp_path = f"{self.cookie_file}.tmp"
+            with open(temp_path, "w") as file:
+                json.dump(cookies, file)
+            os.replace(temp_path, self.cookie_file)
+
+    def send(self, method, url, headers=None, stream=False, json_body=None):
+        """
+        Send a request with a pooled session, warming up cookies only when needed and
+        retrying once with fresh cookies if a challenge page comes back.
+        With stream=True the body is left unread for the caller to consume, and the session
+        only goes back to the pool once the caller closes the response, so no other thread
+        uses it while the body is still being read. Callers must always close streamed responses.
+        """
+        scraper = self.acquire()
+        try:
+            if not has_valid_cookies(scraper.cookies):
+                self.warm_up(scraper)
+            response = self.request(scraper, url, self.with_csrf(scraper, method, headers), stream, method, json_body)
+            if is_challenge(response):
+                response.close()
+                scraper.cookies.clear()
+                self.warm_up(scraper)
+                response = self.request(scraper, url, self.with_csrf(scraper, method, headers), stream, method,
+                                        json_body)
+        except BaseException:
+            self.release(scraper)
+            raise
+        if stream:
+            self.release_on_close(scraper, response)
+        else:
+            self.release(scraper)
+        return response
+
+    def release_on_close(self, scraper, response):
+        """
+        Return the session to the pool the first time the response is closed.
+        """
+        close = response.close
+        once = threading.Lock()
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if once.acquire(blocking=False):
+                    self.release(scraper)
+        response.close = close_and_release
+
+    def with_csrf(self, scraper, method, headers):
+        """
+        POST requests (the GraphQL API) must echo the csrftoken cookie in a header.
+        """
+        token = csrf_token(scraper.cookies)
+        if method == "GET" or not token:
+            return headers
+        return {"x-csrftoken": token, **(headers or {})}
+
+    def get(self, url, headers=None, stream=False):
+        return self.send("GET", url, headers, stream)
+
+    def post(self, url, json_body, headers=None):
+        return self.send("POST", url, headers, json_body=json_body)
+
+default_pool = None
+default_pool_lock = threading.Lock()
+
+def get_pool():
+    """
+    Return the process-wide scraper pool, creating it on first use.
+    """
+    global default_pool
+    with default_pool_lock:
+        if default_pool is None:
+            default_pool = ScraperPool()
+        return default_pool
@@ -0,0 +1,258 @@
+import os
+import sys
+import json
+import math
+import random
+import string
+import argparse
+import tempfile
+import statistics
+
+# test.py shares its name with the standard library's test package. Python puts this folder first
+# on sys.path, except under -P, -I or PYTHONSAFEPATH, where `import test` would find the stdlib one
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from literals import parse_input_with_type_and_structure, determine_cpp_type
+from test import prepare_cpp_solution, encode_cpp_value, run_cpp_measured, get_python_pool, DEFAULT_PROFILE, BUILD_PROFILES
+
+try:
+    import numpy
+except ImportError:  # Generation falls back to the standard library
+    numpy = None
+
+DEFAULT_SIZES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+STRESS_REPEAT = int(os.environ.get("STRESS_REPEAT", "3"))
+STRESS_MAX_SECONDS = float(os.environ.get("STRESS_MAX_SECONDS", "10"))
+
+# Candidate growth curves for the empirical fit
+COMPLEXITY_CLASSES = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n^2)": lambda n: float(n) ** 2,
+    "O(n^3)": lambda n: float(n) ** 3,
+}
+
+def value_shape(value, python_type):
+    """
+    Describe the shape of a sample value so inputs like it can be generated at any size.
+    Lists and strings grow with n, matrices grow to about n elements, scalars keep their sample range.
+    Matrices whose rows all have the same length keep that width unless the sample is square
+    (intervals or edges stay pairs, grids and boards stay square).
+    """
+    if python_type == "vector of vectors":
+        items = [item for row in value for item in row]
+        widths = {len(row) for row in value}
+        width = widths.pop() if len(widths) == 1 and len(value) != len(value[0]) else None
+        return {"kind": "matrix", "element": element_shape(items), "width": width}
+    if python_type == "list":
+        return {"kind": "list", "element": element_shape(value)}
+    if python_type == "string":
+        return {"kind": "string", "alphabet": sorted(set(value)) or list(string.ascii_lowercase)}
+    if isinstance(value, bool):
+        return {"kind": "bool"}
+    if isinstance(value, int):
+        return {"kind": "int", "low": min(value, 0), "high": max(value, 1), "scaled": False}
+    if isinstance(value, float):
+        return {"kind": "float", "low": min(value, 0.0), "high": max(value, 1.0), "scaled": False}
+    raise ValueError(f"Cannot generate inputs shaped like {value!r}")
+
+def element_shape(items):
+    """
+    Shape of the elements of a sample list. Integer ranges grow with n so that large inputs
+    are not made of a handful of repeated values.
+    """
+    if items and all(isinstance(item, bool) for item in items):
+        return {"kind": "bool"}
+    if all(isinstance(item, int) for item in items):
+        low = min(items, default=0)
+        high = max(items, default=1)
+        return {"kind": "int", "low": low, "high": high, "scaled": True}
+    if all(isinstance(item, (int, float)) for item in items):
+        return {"kind": "float", "low": min(items), "high": max(items), "scaled": True}
+    if all(isinstance(item, str) for item in items):
+        alphabet = sorted(set("".join(items))) or list(string.ascii_lowercase)
+        length = max(1, round(statistics.mean(len(item) for item in items)))
+        return {"kind": "string", "alphabet": alphabet, "length": length}
+    raise ValueError(f"Cannot generate list elements shaped like {items[:3]!r}")
+
+def scaled_range(shape, n):
+    """
+    Value range for n generated elements: the sample range widened to about +/-n.
+    """
+    low, high = shape["low"], shape["high"]
+    if shape["scaled"]:
+        high = max(high, n)
+        if low < 0:
+            low = min(low, -n)
+    return low, high
+
+def generate_elements(shape, count, n, rng):
+    """
+    Generate `count` elements in one batch, vectorized with numpy when it is installed.
+    """
+    kind = shape["kind"]
+    if kind == "bool":
+        if numpy is not None:
+            return rng["numpy"].integers(0, 2, size=count).astype(bool).tolist()
+        return [bit == "1" for bit in format(rng["random"].getrandbits(count), f"0{count}b")] if count else []
+    if kind == "int":
+        low, high = scaled_range(shape, n)
+        if numpy is not None:
+            return rng["numpy"].integers(low, high + 1, size=count).tolist()
+        return rng["random"].choices(range(low, high + 1), k=count)
+    if kind == "float":
+        low, high = scaled_range(shape, n)
+        if numpy is not None:
+            return rng["numpy"].uniform(low, high, size=count).tolist()
+        return [rng["random"].uniform(low, high) for _ in range(count)]
+    if kind == "string":
+        text = "".join(rng["random"].choices(shape["alphabet"], k=count * shape["length"]))
+        return [text[i:i + shape["length"]] for i in range(0, len(text), shape["length"])]
+    raise ValueError(f"Unknown element kind {kind}")
+
+def generate_value(shape, n, rng):
+    kind = shape["kind"]
+    if kind == "list":
+        return generate_elements(shape["element"], n, n, rng)
+    if kind == "matrix":
+        if shape["width"]:
+            width, rows = shape["width"], max(1, n // shape["width"])
+        else:
+            width = rows = max(1, math.isqrt(n))
+        flat = generate_elements(shape["element"], rows * width, n, rng)
+        return [flat[row * width:(row + 1) * width] for row in range(rows)]
+    if kind == "string":
+        return "".join(rng["random"].choices(shape["alphabet"], k=n))
+    return generate_elements(shape, 1, 1, rng)[0]
+
+def infer_shapes(test_case):
+    """
+    Infer the shape of every parameter from a saved test case, in input order.
+    Returns (name, shape, cpp_type) tuples.
+    """
+    parsed_input = parse_input_with_type_and_structure(test_case["input"])
+    return [
+        (name, value_shape(value, python_type), determine_cpp_type(python_type, value))
+        for name, (value, python_type) in parsed_input.items()
+    ]
+
+def generate_case(shapes, n, seed):
+    rng = {"random": random.Random(seed), "numpy": numpy.random.default_rng(seed) if numpy is not None else None}
+    return {name: generate_value(shape, n, rng) for name, shape, _ in shapes}
+
+def fit_complexity(sizes, times):
+    """
+    Fit t = c * f(n) for every candidate growth curve and return the best class,
+    the relative error of each fit and the slope of log(t) against log(n).
+    """
+    errors = {}
+    for name, curve in COMPLEXITY_CLASSES.items():
+        values = [curve(n) for n in sizes]
+        scale = sum(t * v for t, v in zip(times, values)) / sum(v * v for v in values)
+        errors[name] = math.sqrt(statistics.mean(((t - scale * v) / t) ** 2 for t, v in zip(times, values)))
+    slope = None
+    if len(sizes) >= 2:
+        xs = [math.log(n) for n in sizes]
+        ys = [math.log(t) for t in times]
+        mean_x, mean_y = statistics.mean(xs), statistics.mean(ys)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+    return min(errors, key=errors.get), errors, slope
+
+def time_python(solution_file_path, args, repeat, pool):
+    result = pool.run(solution_file_path, [args], bench=(0, repeat, False))[0]
+    if result["status"] != "ok":
+        return None, result["error"]
+    return statistics.median(result["time"]["walls"]), None
+
+def time_cpp(prepared, names, args, repeat):
+    """
+    Time solution() inside the harness on one generated case, excluding process startup and input parsing.
+    """
+    out = []
+    for name in names:
+        encode_cpp_value(args[name], out)
+    with tempfile.NamedTemporaryFile("w", suffix=".in", delete=False, encoding="utf-8") as file:
+        file.write("1\n")
+        file.write(" ".join(out))
+        file.write("\n")
+        input_path = file.name
+    try:
+        solves = []
+        for _ in range(repeat):
+            _, wall, _, _, solve, error = run_cpp_measured(prepared["executable_path"], input_path)
+            if error:
+                return None, error
+            solves.append(solve if solve is not None else wall)
+        return statistics.median(solves), None
+    finally:
+        os.remove(input_path)
+
+def stress_solution(solution_file_path, sizes=DEFAULT_SIZES, repeat=STRESS_REPEAT, case_index=0,
+                    seed=0, max_seconds=STRESS_MAX_SECONDS, profile=DEFAULT_PROFILE):
+    """
+    Time the solution on generated inputs shaped like one of its test cases at growing sizes,
+    then estimate its complexity class. Growth stops once a size takes longer than max_seconds.
+    """
+    problem_folder = os.path.dirname(solution_file_path)
+    with open(os.path.join(problem_folder, "test_cases_named.json"), "r") as file:
+        test_cases = json.load(file)
+    shapes = infer_shapes(test_cases[case_index])
+    language = solution_file_path.split(".")[-1].lower()
+
+    if language == "cpp":
+        prepared = prepare_cpp_solution(solution_file_path, profile)
+        if not prepared:
+            return None
+        names = prepared["param_names"]
+        timer = lambda args: time_cpp(prepared, names, args, repeat)
+    else:
+        pool = get_python_pool(workers=1, timeout=max_seconds)
+        timer = lambda args: time_python(solution_file_path, args, repeat, pool)
+
+    for name, shape, cpp_type in shapes:
+        print(f"{name}: {shape['kind']} ({cpp_type})")
+    print(f"\n{'n':>10} {'median ms':>12}")
+    measured_sizes, times = [], []
+    for n in sizes:
+        args = generate_case(shapes, n, seed + n)
+        elapsed, error = timer(args)
+        if elapsed is None:
+            print(f"{n:>10} {'stopped':>12}  ({error})")
+            break
+        print(f"{n:>10} {elapsed * 1000:>12.3f}")
+        measured_sizes.append(n)
+        times.append(max(elapsed, 1e-9))
+        if elapsed > max_seconds:
+            break
+
+    if len(measured_sizes) < 3:
+        print("\nNot enough sizes completed to estimate the complexity.")
+        return {"sizes": measured_sizes, "times": times, "estimate": None}
+    estimate, errors, slope = fit_complexity(measured_sizes, times)
+    print(f"\nEstimated complexity: {estimate} (log-log slope {slope:.2f})")
+    return {"sizes": measured_sizes, "times": times, "estimate": estimate, "fit_errors": errors, "slope": slope}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time a solution on growing generated inputs and estimate its complexity.")
+    parser.add_argument('solution_file_path', help="Path to solution.py or solution.cpp")
+    parser.add_argument('--sizes', type=str, default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="Comma-separated input sizes")
+    parser.add_argument('--repeat', type=int, default=STRESS_REPEAT, help="Timed runs per size")
+    parser.add_argument('--case', type=int, default=1, help="Test case whose input shape is used (1-based)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--max-seconds', type=float, default=STRESS_MAX_SECONDS,
+                        help="Stop growing once one run takes longer than this")
+    parser.add_argument('--profile', choices=sorted(BUILD_PROFILES), default="release", help="C++ build profile")
+    parser.add_argument('--json', action='store_true', help="Print the measurements as JSON")
+    args = parser.parse_args()
+
+    try:
+        report = stress_solution(args.solution_file_path, [int(n) for n in args.sizes.split(",")], args.repeat,
+                                 args.case - 1, args.seed, args.max_seconds, args.profile)
+    except (OSError, ValueError, IndexError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if args.json and report:
+        print(json.dumps(report, indent=4))
@@ -4,309 +4,1075 @@ import json
 import re
 import importlib.util
 import sys
-import cloudscraper
-from bs4 import BeautifulSoup
+import math
+import platform
+import signal
+import hashlib
+import argparse
+import copy
+import time
+import statistics
+import tracemalloc
+import tempfile
+import atexit
+import threading
+import multiprocessing
+import multiprocessing.connection
+from collections import deque
+from datetime import datetime
 
-def compile_cpp_solution(solution_file_path):
-    try:
-        executable_path = solution_file_path.replace(".cpp", "")
-        subprocess.run(["g++", "-std=c++20", "-w", "-o", executable_path, solution_file_path], check=True)
-        return executable_path
-    except subprocess.CalledProcessError as e:
-        print(f"Compilation failed: {e}")
-        return None
+from literals import parse_assignments, parse_input_with_type_and_structure
+from compare import compare_output, compare_stream, preview, DEFAULT_TOLERANCE
+from watch import create_watcher, WATCH_INTERVAL
+from run_history import get_history, print_comparison, RUN_HISTORY
 
-def determine_cpp_type(python_type, value):
-    """
-    Map Python types to equivalent C++ types.
-    """
-    if python_type == "int":
-        return "int"
-    elif python_type == "float":
-        return "double"
-    elif python_type == "string":
-        return "string"
-    elif python_type == "bool":
-        return "bool"
-    elif python_type == "list":
-        if all(isinstance(item, int) for item in value):
-            return "vector<int>"
-        elif all(isinstance(item, (int, float)) for item in value):
-            return "vector<double>"
-        elif all(isinstance(item, bool) for item in value):
-            return "vector<bool>"
-        else:
-            return "vector<auto>"
-    elif python_type == "vector of vectors":
-        inner_type = determine_cpp_type("list", value[0])  # Assume homogeneous lists
-        return f"vector<{inner_type}>"
-    else:
-        return "auto"
+try:
+    import resource
+except ImportError:  # Resource limits are not available on Windows
+    resource = None
+
+CXX = os.environ.get("CXX", "g++")
+BUILD_DIR = os.environ.get(
+    "CPP_BUILD_DIR", os.path.join(os.path.expanduser("~"), ".leetcode_fetcher", "build")
+)
+EXE_SUFFIX = ".exe" if os.name == "nt" else ""
+BASE_FLAGS = ["-std=c++20", "-w"]
+BUILD_PROFILES = {
+    "debug": ["-O0"],
+    "release": ["-O2"],
+    "sanitize": ["-O1", "-g", "-fsanitize=address,undefined", "-fno-omit-frame-pointer"],
+}
+DEFAULT_PROFILE = os.environ.get("CPP_PROFILE", "debug")
+CASE_TIMEOUT = float(os.environ.get("CASE_TIMEOUT", "10"))
+CASE_MEMORY_MB = int(os.environ.get("CASE_MEMORY_MB", "1024"))
+BENCH_REPEAT = int(os.environ.get("BENCH_REPEAT", "10"))
+BENCH_WARMUP = int(os.environ.get("BENCH_WARMUP", "2"))
 
-def parse_input_with_type_and_structure(input_string):
+SOLUTION_FILES = ("solution.py", "solution.cpp")
+
+toolchain_ids = {}
+
+def content_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:20]
+
+def toolchain_id():
     """
-    Parse the input string into a dictionary of variable names and their Python values,
-    determine the type of each variable, and identify structures like 'vector of vectors'.
+    Identify the C++ compiler so cached artifacts are never reused across toolchains.
     """
-    variables = {}
-    pattern = r'(\w+)\s*=\s*(.+)'
-    matches = re.finditer(pattern, input_string)
-    for match in matches:
-        var, value = match.groups()
+    if CXX not in toolchain_ids:
         try:
-            if value.startswith("[") and value.endswith("]"):
-                parsed_value = json.loads(value)
-                if isinstance(parsed_value, list) and all(isinstance(item, list) for item in parsed_value):
-                    value_type = "vector of vectors"
-                else:
-                    value_type = "list"
-            elif value.startswith('"') or value.startswith("'"):
-                parsed_value = value.strip('"').strip("'")
-                value_type = "string"
-            elif value.isdigit():
-                parsed_value = int(value)
-                value_type = "int"
-            elif re.match(r"^\d+\.\d+$", value):
-                parsed_value = float(value)
-                value_type = "float"
-            else:
-                parsed_value = eval(value)
-                value_type = type(parsed_value).__name__
-            variables[var] = (parsed_value, value_type)
-        except Exception as e:
-            print(f"Error parsing value for variable '{var}': {e}")
-            raise ValueError(f"Invalid value for variable '{var}'")
-    return variables
-
-def generate_cpp_code(parsed_input, test_case_idx):
-    """
-    Generate C++ code for test cases.
-    """
-    cpp_code = ""
-    
-    if test_case_idx == 1:
-        cpp_code += "// Declare and initialize variables\n"
-        for var_name, (var_value, value_type) in parsed_input.items():
-            # Determine the C++ type based on the value
-            cpp_type = determine_cpp_type(value_type, var_value)
-            
-            if isinstance(var_value, list):
-                cpp_code += f"{cpp_type} {var_name} = {python_list_to_cpp_vector(var_value)};\n"
-            elif isinstance(var_value, str):
-                cpp_code += f'{cpp_type} {var_name} = "{var_value}";\n'
-            elif isinstance(var_value, (int, float)):
-                cpp_code += f"{cpp_type} {var_name} = {var_value};\n"
-        cpp_code += "solution(" + ", ".join(parsed_input.keys()) + ");\n"
-        cpp_code += 'cout << endl;\n\n'
-    else:
-        cpp_code += f"// Test Case {test_case_idx}\n"
-        for var_name, (var_value, value_type) in parsed_input.items():
-            cpp_type = determine_cpp_type(value_type, var_value)
-
-            if isinstance(var_value, list):
-                cpp_code += f"{var_name} = {python_list_to_cpp_vector(var_value)};\n"
-            elif isinstance(var_value, str):
-                cpp_code += f'{var_name} = "{var_value}";\n'
-            elif isinstance(var_value, (int, float)):
-                cpp_code += f"{var_name} = {var_value};\n"
-        cpp_code += "solution(" + ", ".join(parsed_input.keys()) + ");\n"
-        cpp_code += 'cout << endl;\n\n'
+            version = subprocess.run([CXX, "--version"], capture_output=True, text=True).stdout
+        except OSError:
+            version = ""
+        toolchain_ids[CXX] = f"{CXX}\n{version}"
+    return toolchain_ids[CXX]
 
-    return cpp_code
+def profile_flags(profile):
+    return BASE_FLAGS + BUILD_PROFILES[profile]
 
-def python_list_to_cpp_vector(py_list):
+def build_precompiled_header(flags):
     """
-    Convert a Python list (including nested lists) into C++ vector syntax.
+    Precompile bits/stdc++.h once per toolchain and flag set.
+    Returns an include directory that makes `#include <bits/stdc++.h>` pick up the
+    precompiled header, or None if the compiler does not support GCC-style headers.
     """
-    if isinstance(py_list, list):
-        return "{" + ", ".join(python_list_to_cpp_vector(item) for item in py_list) + "}"
-    elif isinstance(py_list, str):
-        return f'"{py_list}"'
-    else:
-        return str(py_list)
+    toolchain = toolchain_id()
+    if "clang" in toolchain.lower():
+        return None
+    pch_dir = os.path.join(BUILD_DIR, "pch", content_hash(toolchain, *flags))
+    gch_path = os.path.join(pch_dir, "bits", "stdc++.h.gch")
+    if os.path.exists(gch_path):
+        return pch_dir
+
+    os.makedirs(os.path.dirname(gch_path), exist_ok=True)
+    wrapper_path = os.path.join(pch_dir, "stdcxx.h")
+    with open(wrapper_path, "w") as file:
+        file.write("#include <bits/stdc++.h>\n")
+    temp_path = f"{gch_path}.{os.getpid()}.tmp"
+    print("Precompiling bits/stdc++.h (once per toolchain and profile)...")
+    result = subprocess.run([CXX, *flags, "-x", "c++-header", wrapper_path, "-o", temp_path],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"Precompiled header build failed, compiling without it: {result.stderr.strip()}")
+        return None
+    os.replace(temp_path, gch_path)
+    return pch_dir
 
-def inject_test_case_code(solution_file_path, test_case_code):
+def compile_cpp_object(source_path, source_code, flags, pch_dir):
     """
-    Inject test case code into the C++ solution file.
+    Compile one translation unit into an object file cached by the hash of its source,
+    the compiler and the flags. Returns the object path, or None if compilation failed.
     """
-    with open(solution_file_path, "r") as f:
-        lines = f.readlines()
-    
-    for i, line in enumerate(lines):
-        if "return 0;" in line:
-            lines.insert(i, test_case_code)
-            break
-    
-    with open(solution_file_path, "w") as f:
-        f.writelines(lines)
+    object_path = os.path.join(BUILD_DIR, "obj", content_hash(toolchain_id(), source_code, *flags) + ".o")
+    if os.path.exists(object_path):
+        return object_path
 
-def run_cpp_solution(executable_path):
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+    include_flags = ["-I", pch_dir] if pch_dir else []
+    temp_path = f"{object_path}.{os.getpid()}.tmp"
     try:
-        process = subprocess.run([executable_path], text=True, capture_output=True, check=True)
-        return process.stdout.strip()
+        subprocess.run([CXX, *flags, *include_flags, "-c", source_path, "-o", temp_path], check=True)
     except subprocess.CalledProcessError as e:
-        print(f"Error executing solution: {e}")
+        print(f"Compilation failed: {e}")
         return None
+    os.replace(temp_path, object_path)
+    return object_path
 
-def restore_cpp_solution(solution_file_path):
+def build_cpp_executable(solution_file_path, solution_code, harness_code, profile=DEFAULT_PROFILE):
     """
-    Restore the C++ solution file by removing the injected code.
+    Build the test executable from separately compiled solution and harness objects.
+
+    Every artifact is cached by content hash, so an unchanged solution is never recompiled
+    (changing only the test cases costs a harness compile and a relink) and an unchanged
+    solution and harness reuse the previous executable outright.
     """
-    with open(solution_file_path, "r") as f:
-        lines = f.readlines()
+    flags = profile_flags(profile)
+    pch_dir = build_precompiled_header(flags)
 
-    lines = [line for line in lines if "// Auto-generated test case code" not in line]
+    solution_object = compile_cpp_object(solution_file_path, solution_code, flags, pch_dir)
+    if not solution_object:
+        return None
 
-    with open(solution_file_path, "w") as f:
-        f.writelines(lines)
+    harness_path = os.path.join(BUILD_DIR, "src", content_hash(harness_code) + ".cpp")
+    if not os.path.exists(harness_path):
+        os.makedirs(os.path.dirname(harness_path), exist_ok=True)
+        with open(harness_path, "w") as file:
+            file.write(harness_code)
+    harness_object = compile_cpp_object(harness_path, harness_code, flags, pch_dir)
+    if not harness_object:
+        return None
 
-def test_cpp_solution(solution_file_path):
-    problem_folder = os.path.dirname(solution_file_path)
-    test_cases_path = os.path.join(problem_folder, "test_cases_named.json")
+    executable_path = os.path.join(
+        BUILD_DIR, "bin", content_hash(solution_object, harness_object, *flags) + EXE_SUFFIX
+    )
+    if os.path.exists(executable_path):
+        return executable_path
+
+    os.makedirs(os.path.dirname(executable_path), exist_ok=True)
+    temp_path = f"{executable_path}.{os.getpid()}.tmp{EXE_SUFFIX}"
     try:
-        with open(test_cases_path, "r") as file:
-            test_cases = json.load(file)
-    except Exception as e:
-        print(f"Error reading test cases: {e}")
-        return
+        subprocess.run([CXX, *flags, solution_object, harness_object, "-o", temp_path], check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Linking failed: {e}")
+        return None
+    os.replace(temp_path, executable_path)
+    return executable_path
 
-    test_case_code = ""
-    for idx, case in enumerate(test_cases, start=1):
-        inputs = case["input"]
-        expected_output = case["output"]
+CPP_READERS = r"""
+// Typed readers for the length-prefixed input format written by encode_cpp_value()
+void read_value(istream &in, bool &value) { int flag; in >> flag; value = flag != 0; }
+void read_value(istream &in, string &value) {
+    size_t length; in >> length; in.get();
+    value.resize(length);
+    in.read(value.data(), length);
+}
+void read_value(istream &in, char &value) { string text; read_value(in, text); value = text.empty() ? '\0' : text[0]; }
+template <typename T> void read_value(istream &in, T &value) { in >> value; }
+template <typename T> void read_value(istream &in, vector<T> &value) {
+    size_t length; in >> length;
+    value.clear();
+    value.reserve(length);
+    for (size_t i = 0; i < length; i++) { T item{}; read_value(in, item); value.push_back(std::move(item)); }
+}
+"""
 
-        try:
-            parsed_input = parse_input_with_type_and_structure(inputs)
-            test_case_code += generate_cpp_code(parsed_input, idx)
-        except Exception as e:
-            print(f"Error parsing or generating code for test case {idx}: {e}")
-            return
+CPP_STATS_REPORT = r"""
+// This process's peak resident memory in KB, or -1 where /proc is not available. Memory is read
+// from /proc because on Linux the rusage of a spawned child also counts the parent's memory from
+// before the exec.
+long long peak_memory_kb() {
+    ifstream status("/proc/self/status");
+    string line;
+    while (getline(status, line)) {
+        if (line.rfind("VmHWM:", 0) == 0) return stoll(line.substr(6));
+    }
+    return -1;
+}
 
-    try:
-        with open(solution_file_path, "r") as file:
-            original_code = file.read()
+// Print the time spent inside solution() and the peak memory for benchmarks.
+void report_stats(long long solve_ns) {
+    cerr << "\nsolve_ns=" << solve_ns << endl;
+    long long peak_kb = peak_memory_kb();
+    if (peak_kb >= 0) cerr << "peak_kb=" << peak_kb << endl;
+}
+"""
+
+def read_solution_signature(solution_code):
+    """
+    Find the solution() definition in the user's C++ code.
+    Returns its prototype, parameter names and parameter value types, or None if it cannot be found.
+    """
+    match = re.search(r"([\w:<>]+(?:\s*[*&])?)\s+solution\s*\(([^)]*)\)\s*\{", solution_code)
+    if not match:
+        return None
+    return_type, params = match.groups()
+
+    # Split parameters on top-level commas only, since types like map<int, int> contain commas
+    param_list, depth, current = [], 0, ""
+    for char in params:
+        if char == "<":
+            depth += 1
+        elif char == ">":
+            depth -= 1
+        if char == "," and depth == 0:
+            param_list.append(current.strip())
+            current = ""
+        else:
+            current += char
+    if current.strip():
+        param_list.append(current.strip())
+
+    names, types = [], []
+    for param in param_list:
+        name = re.search(r"(\w+)\s*$", param)
+        if not name:
+            return None
+        names.append(name.group(1))
+        param_type = param[:name.start()].replace("&", "")
+        types.append(re.sub(r"\bconst\b", "", param_type).strip())
+    return f"{return_type} solution({params});", names, types
+
+def generate_cpp_harness(prototype, param_names, param_types):
+    """
+    Generate a test harness that reads any number of test cases from stdin and calls solution() on each.
+    It only depends on the solution's signature, so one build serves every set of test cases.
+    """
+    declarations = "".join(
+        f"        {param_type} {name}{{}};\n        read_value(cin, {name});\n"
+        for name, param_type in zip(param_names, param_types)
+    )
+    return f"""#include <bits/stdc++.h>
+using namespace std;
+{CPP_READERS}{CPP_STATS_REPORT}
+{prototype}
 
-        main_injection = f"""
 int main() {{
-{test_case_code}
+    ios::sync_with_stdio(false);
+    size_t cases;
+    long long solve_ns = 0;
+    if (!(cin >> cases)) return 0;
+    for (size_t i = 0; i < cases; i++) {{
+{declarations}        auto solve_start = chrono::steady_clock::now();
+        solution({", ".join(param_names)});
+        long long case_ns = chrono::duration_cast<chrono::nanoseconds>(chrono::steady_clock::now() - solve_start).count();
+        solve_ns += case_ns;
+        cout << "\\n\\x1e" << case_ns << " " << peak_memory_kb() << endl;
+    }}
+    if (getenv("LEETCODE_REPORT_STATS")) report_stats(solve_ns);
     return 0;
 }}
 """
-        with open(solution_file_path, "w") as file:
-            file.write(original_code)
-            file.write(main_injection)
 
+def encode_cpp_value(value, out):
+    """
+    Append the harness input encoding of a value to the list `out`: numbers as text,
+    booleans as 0/1, strings as '<byte length> <bytes>' and lists as '<length>' followed by their items.
+    """
+    if isinstance(value, bool):
+        out.append("1" if value else "0")
+    elif isinstance(value, (int, float)):
+        out.append(repr(value))
+    elif isinstance(value, str):
+        out.append(f"{len(value.encode('utf-8'))} {value}")
+    elif isinstance(value, list):
+        out.append(str(len(value)))
+        for item in value:
+            encode_cpp_value(item, out)
+    else:
+        raise ValueError(f"Unsupported value for the C++ harness: {value!r}")
+
+def write_cpp_input(test_cases, param_names, input_path):
+    """
+    Encode every test case into the harness input file, one case at a time.
+    """
+    temp_path = f"{input_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8", newline="\n") as file:
+        file.write(f"{len(test_cases)}\n")
+        for idx, case in enumerate(test_cases, start=1):
+            parsed_input = parse_input_with_type_and_structure(case["input"])
+            missing = [name for name in param_names if name not in parsed_input]
+            if missing:
+                raise ValueError(f"Test case {idx} has no input named {', '.join(missing)}")
+            out = []
+            for name in param_names:
+                encode_cpp_value(parsed_input[name][0], out)
+            file.write(" ".join(out))
+            file.write("\n")
+    os.replace(temp_path, input_path)
+
+def prepare_cpp_solution(solution_file_path, profile=DEFAULT_PROFILE):
+    """
+    Build the solution's test executable and encode its test cases.
+    Returns the test cases, parameter names, executable path and input file path,
+    or None after printing the reason if any step fails.
+    """
+    problem_folder = os.path.dirname(solution_file_path)
+    test_cases_path = os.path.join(problem_folder, "test_cases_named.json")
+    try:
+        with open(test_cases_path, "rb") as file:
+            test_cases_data = file.read()
+        test_cases = json.loads(test_cases_data)
     except Exception as e:
-        print(f"Error writing test cases to solution file: {e}")
-        return
+        print(f"Error reading test cases: {e}")
+        return None
+
+    try:
+        with open(solution_file_path, "r") as file:
+            solution_code = file.read()
+    except Exception as e:
+        print(f"Error reading solution file: {e}")
+        return None
 
-    executable_path = compile_cpp_solution(solution_file_path)
+    signature = read_solution_signature(solution_code)
+    if not signature:
+        print("Could not find the solution() function in the solution file.")
+        return None
+    prototype, param_names, param_types = signature
+
+    # Test cases are streamed to the binary's stdin from an encoded file that is rebuilt
+    # only when the test cases or the parameter order change
+    input_path = os.path.join(
+        BUILD_DIR, "input", content_hash(test_cases_data.decode("utf-8"), *param_names) + ".in"
+    )
+    if not os.path.exists(input_path):
+        try:
+            os.makedirs(os.path.dirname(input_path), exist_ok=True)
+            write_cpp_input(test_cases, param_names, input_path)
+        except Exception as e:
+            print(f"Error parsing or encoding test cases: {e}")
+            return None
+
+    harness_code = generate_cpp_harness(prototype, param_names, param_types)
+    executable_path = build_cpp_executable(solution_file_path, solution_code, harness_code, profile)
     if not executable_path:
         print("Failed to compile the solution.")
-        return
+        return None
 
-    print("Compiled successfully. Running test cases...\n")
-    try:
-        process = subprocess.run([executable_path], text=True, capture_output=True, check=True)
-        cpp_output = process.stdout.strip()
+    return {
+        "test_cases": test_cases,
+        "param_names": param_names,
+        "executable_path": executable_path,
+        "input_path": input_path,
+    }
 
-        print("Your Output:")
-        print(cpp_output)
+def cpp_run_limits(cpu_seconds=None, memory_mb=None):
+    """
+    preexec_fn that puts a CPU time and address-space limit on a C++ run,
+    or None where the platform has no resource limits.
+    """
+    if not resource or not (cpu_seconds or memory_mb):
+        return None
 
-        print("Expected Output:")
-        for idx, case in enumerate(test_cases, start=1):
-            expected_output = case["output"]
-            print(f"{expected_output}")
+    def apply_limits():
+        if cpu_seconds:
+            seconds = int(math.ceil(cpu_seconds))
+            resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+        if memory_mb:
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    return apply_limits
+
+def run_cpp_cases(prepared, unordered=False, tolerance=DEFAULT_TOLERANCE, fail_fast=False, timeout=None,
+                  memory_mb=None):
+    """
+    Run the executable built by prepare_cpp_solution() on every test case and compare each case's
+    output as soon as the binary prints it. stdout is read incrementally, so only one case's output
+    is held in memory at a time. With fail_fast the binary is stopped at the first mismatch.
 
+    With `timeout` (seconds per case) the run is limited to that much CPU time per case and killed
+    once its wall time passes the same budget; `memory_mb` limits its address space. Returns one
+    result per case.
+    """
+    test_cases = prepared["test_cases"]
+    budget = timeout * max(len(test_cases), 1) if timeout else None
+    results = []
+    # stderr goes to a file: a pipe that nobody reads while stdout is streamed would block a
+    # solution that writes a lot of debug output to cerr
+    with open(prepared["input_path"], "rb") as input_file, tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen([prepared["executable_path"]], stdin=input_file,
+                                   stdout=subprocess.PIPE, stderr=stderr_file,
+                                   preexec_fn=cpp_run_limits(budget, memory_mb))
+        expired = threading.Event()
+
+        def expire():
+            expired.set()
+            process.kill()
+        killer = threading.Timer(budget, expire) if budget else None
+        if killer:
+            killer.start()
+        try:
+            for result in compare_stream(process.stdout, test_cases, unordered, tolerance, fail_fast):
+                results.append(result)
+        finally:
+            if killer:
+                killer.cancel()
+            if process.poll() is None and len(results) < len(test_cases):
+                process.kill()
+            process.stdout.close()
+            process.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace").strip()
+
+    if process.returncode not in (0, None) and not (fail_fast and len(results) < len(test_cases)):
+        cpu_exceeded = hasattr(signal, "SIGXCPU") and process.returncode == -signal.SIGXCPU
+        if expired.is_set() or cpu_exceeded:
+            status, error = "timeout", f"Timed out after {budget:g}s for {len(test_cases)} cases"
+        else:
+            status, error = "error", f"Exited with code {process.returncode}" + (f": {stderr[-2000:]}" if stderr else "")
+        for result in results:
+            if result["status"] == "error":
+                result["status"], result["error"] = status, error
+    for idx in range(len(results), len(test_cases)):
+        results.append({"case": idx + 1, "status": "skipped", "output": None, "time": None,
+                        "error": "Not run after an earlier failure", "diff": None})
+    return results
+
+def cpp_memory_limit(profile, memory_mb):
+    # The sanitizers reserve far more address space than any memory limit allows
+    return 0 if profile == "sanitize" else memory_mb
+
+def test_cpp_solution(solution_file_path, profile=DEFAULT_PROFILE, unordered=False, tolerance=DEFAULT_TOLERANCE,
+                      fail_fast=False, timeout=CASE_TIMEOUT, memory_mb=CASE_MEMORY_MB):
+    """
+    Build the solution and run every test case, printing each case's result.
+    The run is limited to `timeout` seconds per case and `memory_mb` of memory (see run_cpp_cases()).
+    """
+    prepared = prepare_cpp_solution(solution_file_path, profile)
+    if not prepared:
+        return
+
+    print("Compiled successfully. Running test cases...\n")
+    try:
+        results = run_cpp_cases(prepared, unordered, tolerance, fail_fast, timeout,
+                                cpp_memory_limit(profile, memory_mb))
     except Exception as e:
         print(f"Error executing solution: {e}")
         return
 
-    try:
-        with open(solution_file_path, "r") as file:
-            solution_code = file.read()
+    print_case_results(results, prepared["test_cases"])
+    return results
+
+def run_cpp_measured(executable_path, input_path, timeout=None, memory_mb=None):
+    """
+    Run the executable once on an input file and measure its wall time, CPU time, time spent
+    inside solution() and peak memory. CPU time comes from wait4() for this child only. Peak memory
+    is the harness's own report where /proc is available, otherwise the child's max RSS from wait4(),
+    and None where neither exists.
+
+    `timeout` and `memory_mb` limit the run as in run_cpp_cases(). Returns the exit code, the
+    measurements and an error message (None when the run succeeded).
+    """
+    env = dict(os.environ, LEETCODE_REPORT_STATS="1")
+    with open(input_path, "rb") as input_file:
+        start = time.perf_counter()
+        process = subprocess.Popen([executable_path], stdin=input_file, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, env=env, preexec_fn=cpp_run_limits(timeout, memory_mb))
+        expired = threading.Event()
+
+        def expire():
+            expired.set()
+            process.kill()
+        killer = threading.Timer(timeout, expire) if timeout else None
+        if killer:
+            killer.start()
+        try:
+            stderr = process.stderr.read().decode("utf-8", errors="replace")
+            process.stderr.close()
+            if hasattr(os, "wait4"):
+                _, status, usage = os.wait4(process.pid, 0)
+                wall = time.perf_counter() - start
+                process.returncode = os.waitstatus_to_exitcode(status)
+                cpu = usage.ru_utime + usage.ru_stime
+                peak_kb = usage.ru_maxrss / 1024 if sys.platform == "darwin" else usage.ru_maxrss
+            else:
+                process.wait()
+                wall = time.perf_counter() - start
+                cpu, peak_kb = None, None
+        finally:
+            if killer:
+                killer.cancel()
+    reported = re.search(r"^peak_kb=(\d+)$", stderr, re.M)
+    if reported:
+        peak_kb = int(reported.group(1))
+    solve = re.search(r"^solve_ns=(\d+)$", stderr, re.M)
+    solve = int(solve.group(1)) / 1e9 if solve else None
+    error = None
+    if process.returncode != 0:
+        if expired.is_set() or (hasattr(signal, "SIGXCPU") and process.returncode == -signal.SIGXCPU):
+            error = f"Timed out after {timeout:g}s"
+        else:
+            stderr = stderr.strip()
+            error = f"Exited with code {process.returncode}" + (f": {stderr[-2000:]}" if stderr else "")
+    return process.returncode, wall, cpu, peak_kb, solve, error
+
+def bench_cpp_solution(solution_file_path, repeat=BENCH_REPEAT, warmup=BENCH_WARMUP, profile=DEFAULT_PROFILE,
+                       timeout=CASE_TIMEOUT, memory_mb=CASE_MEMORY_MB):
+    """
+    Time every test case separately: each case gets its own input file and is run
+    `warmup` times untimed and `repeat` times timed. Wall and CPU times include process startup
+    and input parsing; the time spent inside solution() alone is reported as solve_median_ms.
+    Every run is limited to `timeout` seconds and `memory_mb` of memory, as in test mode.
+    """
+    prepared = prepare_cpp_solution(solution_file_path, profile)
+    if not prepared:
+        return None
+
+    print(f"Compiled with the {profile} profile. Benchmarking {len(prepared['test_cases'])} test cases...\n")
+    results = []
+    for idx, case in enumerate(prepared["test_cases"]):
+        input_path = os.path.join(
+            BUILD_DIR, "input", content_hash(json.dumps(case), *prepared["param_names"]) + ".in"
+        )
+        if not os.path.exists(input_path):
+            write_cpp_input([case], prepared["param_names"], input_path)
 
-        start = solution_code.find("int main()")
-        if start != -1:
-            open_brace_index = solution_code.find("{", start)
-            close_brace_index = solution_code.find("}", open_brace_index)
+        walls, cpus, peaks, solves, status, error = [], [], [], [], "ok", None
+        for run in range(warmup + repeat):
+            returncode, wall, cpu, peak_kb, solve, error = run_cpp_measured(
+                prepared["executable_path"], input_path, timeout, cpp_memory_limit(profile, memory_mb)
+            )
+            if error:
+                status = "timeout" if error.startswith("Timed out") else "error"
+                break
+            if run >= warmup:
+                walls.append(wall)
+                if cpu is not None:
+                    cpus.append(cpu)
+                if peak_kb is not None:
+                    peaks.append(peak_kb)
+                if solve is not None:
+                    solves.append(solve)
+        result = bench_result(idx, status, walls, cpus, max(peaks) if peaks else None, error=error)
+        result["solve_median_ms"] = statistics.median(solves) * 1000 if solves else None
+        results.append(result)
 
-            if open_brace_index != -1 and close_brace_index != -1:
-                brace_depth = 0
-                for i in range(open_brace_index, len(solution_code)):
-                    if solution_code[i] == "{":
-                        brace_depth += 1
-                    elif solution_code[i] == "}":
-                        brace_depth -= 1
-                        if brace_depth == 0:
-                            close_brace_index = i
-                            break
+    return report_benchmark(solution_file_path, "cpp", results, repeat, warmup, profile)
 
-                solution_code = solution_code[:start] + solution_code[close_brace_index + 1:]
+def import_solution_module(solution_file_path, module_name="solution"):
+    spec = importlib.util.spec_from_file_location(module_name, solution_file_path)
+    solution_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(solution_module)
+    return solution_module
 
-                with open(solution_file_path, "w") as file:
-                    file.write(solution_code)
+def load_solution_function(solution_file_path):
+    try:
+        return import_solution_module(solution_file_path).solution
+    except Exception as e:
+        print(f"Error loading solution: {e}")
+        return None
+
+def bench_python_case(solution_function, args, warmup, repeat, trace_memory=True):
+    """
+    Call the solution `warmup` times untimed and `repeat` times timed, on a fresh copy of
+    the arguments each time, then (with trace_memory) once more under tracemalloc to find
+    its peak allocation. Returns the last output and the collected measurements.
+    """
+    walls, cpus = [], []
+    output = None
+    for run in range(warmup + repeat):
+        call_args = copy.deepcopy(args)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        output = solution_function(**call_args)
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        if run >= warmup:
+            walls.append(wall)
+            cpus.append(cpu)
 
+    peak = None
+    if trace_memory:
+        call_args = copy.deepcopy(args)
+        tracemalloc.start()
+        try:
+            solution_function(**call_args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    max_rss_kb = None
+    if resource:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        max_rss_kb = max_rss / 1024 if sys.platform == "darwin" else max_rss
+    peak_kb = peak / 1024 if peak is not None else None
+    return output, {"walls": walls, "cpus": cpus, "peak_kb": peak_kb, "max_rss_kb": max_rss_kb}
+
+def python_worker_main(conn, memory_mb):
+    """
+    Worker process loop: run one test case per message and send back its outcome.
+    The loaded solution is kept until the file changes, so only the first case pays for the import.
+    """
+    if memory_mb and resource:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    solutions = {}
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        solution_file_path, version, idx, args, bench, check = task
+        output, error, diff = None, None, None
+        elapsed = 0.0
+        try:
+            key = (solution_file_path, version)
+            if key not in solutions:
+                solutions.clear()
+                solutions[key] = import_solution_module(solution_file_path).solution
+            if bench:
+                output, elapsed = bench_python_case(solutions[key], args, *bench)
             else:
-                print("Couldn't find a matching brace for main function.")
+                start = time.perf_counter()
+                try:
+                    output = solutions[key](**args)
+                finally:
+                    elapsed = time.perf_counter() - start
+            status = "ok"
+            if check:
+                # Compare here so a large return value never has to cross the pipe
+                expected_output, unordered, tolerance = check
+                passed, diff = compare_output(output, expected_output, unordered, tolerance)
+                status = "ok" if passed else "wrong"
+                output = preview(output)
+        except MemoryError:
+            status, error = "error", "MemoryError: memory limit exceeded"
+        except Exception as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+        try:
+            conn.send((idx, status, output, error, elapsed, diff))
+        except Exception:
+            # The return value could not be pickled; report its text instead
+            conn.send((idx, status, repr(output), error, elapsed, diff))
+
+class PythonTestPool:
+    """
+    Reusable pool of worker processes for running Python test cases in isolation.
+
+    Cases are spread over the workers and collected back in order. A case that runs past
+    `timeout` seconds has its worker killed and replaced, and each worker runs under a
+    `memory_mb` address-space limit where the platform supports resource limits.
+    Workers stay alive between runs, so interpreter startup is only paid once.
+    """
+
+    def __init__(self, workers=None, timeout=CASE_TIMEOUT, memory_mb=CASE_MEMORY_MB):
+        self.size = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.workers = []
+
+    def start_worker(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=python_worker_main, args=(child_conn, self.memory_mb), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        worker = (process, parent_conn)
+        self.workers.append(worker)
+        return worker
+
+    def start(self):
+        """
+        Start every worker ahead of the first run, so no run waits for interpreter startup.
+        """
+        while len(self.workers) < self.size:
+            self.start_worker()
+
+    def stop_worker(self, worker):
+        process, conn = worker
+        if process.is_alive():
+            process.kill()
+        process.join()
+        conn.close()
+        self.workers.remove(worker)
+
+    def run(self, solution_file_path, cases, bench=None, expected=None, unordered=False,
+            tolerance=DEFAULT_TOLERANCE, fail_fast=False):
+        """
+        Run solution(**args) for every args dict in `cases`. Returns one result per case, in order,
+        with the status ("ok", "error" or "timeout"), the returned output, the error and the time taken.
+        With bench=(warmup, repeat[, trace_memory]) each case is run repeatedly and "time" holds the
+        measurements from bench_python_case(); the timeout then applies to each run.
+
+        With `expected` (the expected output text of every case), outputs are compared inside the
+        workers: a mismatch gets the status "wrong" and a short "diff", and "output" is a preview.
+        With fail_fast no new cases are started after the first failure; those are "skipped".
+        """
+        timeout = self.timeout * (bench[0] + bench[1] + 1 if bench else 1)
+        solution_file_path = os.path.abspath(solution_file_path)
+        version = os.stat(solution_file_path).st_mtime_ns
+        results = [None] * len(cases)
+        pending = deque(enumerate(cases))
+
+        for worker in list(self.workers):
+            if not worker[0].is_alive():
+                self.stop_worker(worker)
+        while len(self.workers) < min(self.size, len(cases)):
+            self.start_worker()
+
+        idle = list(self.workers)
+        busy = {}
+        while pending or busy:
+            while pending and idle:
+                worker = idle.pop()
+                idx, args = pending.popleft()
+                check = (expected[idx], unordered, tolerance) if expected is not None else None
+                worker[1].send((solution_file_path, version, idx, args, bench, check))
+                busy[worker[1]] = (worker, idx, time.monotonic() + timeout)
+
+            next_deadline = min(deadline for _, _, deadline in busy.values())
+            ready = multiprocessing.connection.wait(list(busy), max(0.0, next_deadline - time.monotonic()))
+            for conn in ready:
+                worker, idx, _ = busy.pop(conn)
+                try:
+                    _, status, output, error, elapsed, diff = conn.recv()
+                except (EOFError, OSError):
+                    exit_code = worker[0].exitcode
+                    self.stop_worker(worker)
+                    idle.append(self.start_worker())
+                    results[idx] = {"status": "error", "output": None, "time": None,
+                                    "error": f"Worker exited unexpectedly (exit code {exit_code})"}
+                    continue
+                results[idx] = {"status": status, "output": output, "error": error, "time": elapsed, "diff": diff}
+                idle.append(worker)
+
+            now = time.monotonic()
+            for conn, (worker, idx, deadline) in list(busy.items()):
+                if now >= deadline:
+                    del busy[conn]
+                    self.stop_worker(worker)
+                    idle.append(self.start_worker())
+                    results[idx] = {"status": "timeout", "output": None, "time": None,
+                                    "error": f"Timed out after {timeout:g}s"}
+            if fail_fast and any(result and result["status"] != "ok" for result in results):
+                pending.clear()
+        for idx, result in enumerate(results):
+            if result is None:
+                results[idx] = {"status": "skipped", "output": None, "time": None,
+                                "error": "Not run after an earlier failure"}
+        return results
+
+    def close(self):
+        for worker in list(self.workers):
+            try:
+                worker[1].send(None)
+            except OSError:
+                pass
+            self.stop_worker(worker)
+
+python_pool = None
+
+def get_python_pool(workers=None, timeout=CASE_TIMEOUT, memory_mb=CASE_MEMORY_MB):
+    """
+    Return the shared worker pool, creating it on first use.
+    """
+    global python_pool
+    if python_pool is None:
+        python_pool = PythonTestPool(workers, timeout, memory_mb)
+        atexit.register(python_pool.close)
+    return python_pool
+
+def print_case_results(results, test_cases):
+    """
+    Print the status, time, output preview, expected output and difference of every test case,
+    then a summary.
+    """
+    for idx, (result, case) in enumerate(zip(results, test_cases), start=1):
+        timing = f" ({result['time'] * 1000:.2f} ms)" if result["time"] is not None else ""
+        print(f"Case {idx}: {result['status']}{timing}")
+        if result["error"]:
+            print(f"  Error:           {result['error']}")
+        else:
+            print(f"  Your Output:     {result['output']}")
+        print(f"  Expected Output: {preview(case['output'])}")
+        if result.get("diff"):
+            print(f"  Difference:      {result['diff']}")
+    passed = sum(result["status"] == "ok" for result in results)
+    print(f"\nPassed {passed}/{len(results)} test cases.")
+
+def load_python_cases(test_cases):
+    """
+    Turn every test case input into keyword arguments for solution().
+    Returns the argument dicts (None where parsing failed) and the parse errors by case index.
+    """
+    cases, parse_errors = [], {}
+    for idx, case in enumerate(test_cases):
+        inputs = case["input"]
+        try:
+            cases.append(parse_assignments(inputs))
+        except Exception as e:
+            parse_errors[idx] = f"Error parsing test case input: {e}"
+            cases.append(None)
+    return cases, parse_errors
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(-(-fraction * len(ordered) // 1)) - 1))
+    return ordered[rank]
+
+def bench_result(idx, status, walls, cpus, peak_kb, max_rss_kb=None, error=None):
+    """
+    Summarize the repeated measurements of one test case, with times in milliseconds.
+    """
+    result = {"case": idx + 1, "status": status, "runs": len(walls), "peak_kb": peak_kb, "max_rss_kb": max_rss_kb,
+              "wall_samples_ms": [wall * 1000 for wall in walls], "error": error}
+    for name, values in (("wall", walls), ("cpu", cpus)):
+        if values:
+            result[f"{name}_min_ms"] = min(values) * 1000
+            result[f"{name}_median_ms"] = statistics.median(values) * 1000
+            result[f"{name}_p95_ms"] = percentile(values, 0.95) * 1000
         else:
-            print("Main function not found.")
+            result[f"{name}_min_ms"] = result[f"{name}_median_ms"] = result[f"{name}_p95_ms"] = None
+    return result
+
+def report_benchmark(solution_file_path, language, results, repeat, warmup, profile=None, json_path=None):
+    """
+    Print the benchmark table and write the results as JSON (by default to benchmark.json
+    next to the solution). Returns the report.
+    """
+    def cell(value, width):
+        return f"{value:>{width}.2f}" if value is not None else f"{'-':>{width}}"
+
+    print(f"{'Case':>4}  {'Status':<7} {'Min ms':>9} {'Median ms':>10} {'P95 ms':>9} {'CPU med ms':>11} {'Peak KB':>10}")
+    for result in results:
+        print(f"{result['case']:>4}  {result['status']:<7} {cell(result['wall_min_ms'], 9)} "
+              f"{cell(result['wall_median_ms'], 10)} {cell(result['wall_p95_ms'], 9)} "
+              f"{cell(result['cpu_median_ms'], 11)} {cell(result['peak_kb'], 10)}")
+        if result.get("error"):
+            print(f"      Error: {result['error']}")
+
+    report = {
+        "solution": os.path.abspath(solution_file_path),
+        "language": language,
+        "profile": profile,
+        "repeat": repeat,
+        "warmup": warmup,
+        "timestamp": time.time(),
+        "cases": results,
+    }
+    json_path = json_path or os.path.join(os.path.dirname(solution_file_path), "benchmark.json")
+    try:
+        with open(json_path, "w") as file:
+            json.dump(report, file, indent=4)
+        print(f"\nBenchmark results saved in {json_path}.")
+    except OSError as e:
+        print(f"Error saving benchmark results: {e}")
+    return report
 
+def bench_python_solution(solution_file_path, repeat=BENCH_REPEAT, warmup=BENCH_WARMUP, pool=None):
+    """
+    Benchmark every test case in an isolated worker: wall and CPU time over `repeat` timed runs
+    after `warmup` untimed ones, tracemalloc peak allocation and the worker's max RSS.
+    """
+    problem_folder = os.path.dirname(solution_file_path)
+    test_cases_path = os.path.join(problem_folder, "test_cases_named.json")
+    try:
+        with open(test_cases_path, "r") as file:
+            test_cases = json.load(file)
     except Exception as e:
-        print(f"Error removing the main function: {e}")
+        print(f"Error reading test cases: {e}")
+        return None
 
-def load_solution_function(solution_file_path):
+    cases, parse_errors = load_python_cases(test_cases)
+    pool = pool or get_python_pool()
+    runnable = [idx for idx, args in enumerate(cases) if args is not None]
+    print(f"Benchmarking {len(test_cases)} test cases...\n")
     try:
-        spec = importlib.util.spec_from_file_location("solution", solution_file_path)
-        solution_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(solution_module)
-        return solution_module.solution
+        run_results = pool.run(solution_file_path, [cases[idx] for idx in runnable], bench=(warmup, repeat))
     except Exception as e:
-        print(f"Error loading solution: {e}")
+        print(f"Error running solution: {e}")
         return None
 
-def test_python_solution(solution_file_path):
+    results = [bench_result(idx, "error", [], [], None, error=parse_errors.get(idx)) for idx in range(len(cases))]
+    for idx, result in zip(runnable, run_results):
+        if result["status"] != "ok":
+            results[idx] = bench_result(idx, result["status"], [], [], None, error=result.get("error"))
+            continue
+        measured = result["time"]
+        results[idx] = bench_result(idx, "ok", measured["walls"], measured["cpus"],
+                                    measured["peak_kb"], measured["max_rss_kb"])
+    return report_benchmark(solution_file_path, "py", results, repeat, warmup)
+
+def run_python_cases(solution_file_path, test_cases, pool, unordered=False, tolerance=DEFAULT_TOLERANCE,
+                     fail_fast=False):
+    """
+    Run the solution on every test case in the worker pool and compare the outputs there.
+    Returns one result per case; cases whose input could not be parsed are errors.
+    """
+    cases, parse_errors = load_python_cases(test_cases)
+    runnable = [idx for idx, args in enumerate(cases) if args is not None]
+    run_results = pool.run(solution_file_path, [cases[idx] for idx in runnable],
+                           expected=[test_cases[idx]["output"] for idx in runnable],
+                           unordered=unordered, tolerance=tolerance, fail_fast=fail_fast)
+
+    results = [None] * len(cases)
+    for idx, result in zip(runnable, run_results):
+        results[idx] = result
+    for idx, error in parse_errors.items():
+        results[idx] = {"status": "error", "output": None, "error": error, "time": None}
+    return results
+
+def test_python_solution(solution_file_path, pool=None, unordered=False, tolerance=DEFAULT_TOLERANCE,
+                         fail_fast=False):
     problem_folder = os.path.dirname(solution_file_path)
     test_cases_path = os.path.join(problem_folder, "test_cases_named.json")
-    solution_function = load_solution_function(solution_file_path)
-    if not solution_function:
-        print("Solution function not found.")
-        return
     try:
         with open(test_cases_path, "r") as file:
             test_cases = json.load(file)
-            
-        print("Your Output:")
-        for idx, case in enumerate(test_cases, start=1):
-            inputs = case["input"]
-            args = eval(f"dict({inputs})")
-            try:
-                actual_output = solution_function(**args)
-                print(f"{actual_output}")
-            except Exception as e:
-                print(f"Error executing test case {idx}: {e}")
-        
-        print("Expected Output:")
-        for idx, case in enumerate(test_cases, start=1):
-            expected_output = case["output"]
-            try:
-                print(f"{expected_output}")
-            except Exception as e:
-                print(f"Error executing test case {idx}: {e}")
     except Exception as e:
         print(f"Error reading test cases: {e}")
-        
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python test_script.py <solution_file_path>")
-        sys.exit(1)
+        return
 
-    solution_file_path = sys.argv[1]
+    try:
+        results = run_python_cases(solution_file_path, test_cases, pool or get_python_pool(),
+                                   unordered, tolerance, fail_fast)
+    except Exception as e:
+        print(f"Error running solution: {e}")
+        return
+
+    print_case_results(results, test_cases)
+    return results
+
+def history_cases(results, bench=False):
+    """
+    Per-case status, timings in ms and peak memory of a test or benchmark run, for the run history.
+    """
+    if bench:
+        return [{"case": result["case"], "status": result["status"], "times_ms": result["wall_samples_ms"],
+                 "peak_kb": result["peak_kb"]} for result in results]
+    return [{"case": idx, "status": result["status"],
+             "times_ms": [result["time"] * 1000] if result.get("time") is not None else [],
+             "peak_kb": result.get("peak_kb")}
+            for idx, result in enumerate(results, start=1)]
+
+def record_history(solution_file_path, mode, cases, profile=DEFAULT_PROFILE):
+    """
+    Append a run to the run history, keyed by a hash of the solution's content and its compiler
+    flags (or the Python version). Returns the recorded run, or None if it could not be recorded.
+    """
     language = solution_file_path.split(".")[-1].lower()
+    try:
+        with open(solution_file_path, "r") as file:
+            code_hash = content_hash(file.read())
+        flags = " ".join([CXX, *profile_flags(profile)]) if language == "cpp" else f"python {platform.python_version()}"
+        history = get_history()
+        return history.get(history.record(solution_file_path, language, code_hash, flags, mode, cases))
+    except Exception as e:
+        print(f"Error recording the run in the history: {e}")
+        return None
 
+def run_solution(solution_file_path, args, pool=None):
+    """
+    Test or benchmark one solution file with the options parsed from the command line,
+    and record the run in the run history unless disabled.
+    """
+    language = solution_file_path.split(".")[-1].lower()
     if language == "py":
-        test_python_solution(solution_file_path)
+        pool = pool or get_python_pool(args.workers, args.timeout, args.memory)
+        if args.bench:
+            outcome = bench_python_solution(solution_file_path, args.repeat, args.warmup, pool)
+        else:
+            outcome = test_python_solution(solution_file_path, pool, args.unordered, args.tolerance, args.fail_fast)
     elif language == "cpp":
-        test_cpp_solution(solution_file_path)
+        if args.bench:
+            outcome = bench_cpp_solution(solution_file_path, args.repeat, args.warmup, args.profile, args.timeout,
+                                         args.memory)
+        else:
+            outcome = test_cpp_solution(solution_file_path, args.profile, args.unordered, args.tolerance,
+                                        args.fail_fast, args.timeout, args.memory)
+    else:
+        print("Unsupported language. Please use a Python (.py) or C++ (.cpp) file.")
+        return None
+
+    if outcome is not None and args.history:
+        cases = history_cases(outcome["cases"], True) if args.bench else history_cases(outcome)
+        run = record_history(solution_file_path, "bench" if args.bench else "test", cases, args.profile)
+        if run and args.compare:
+            print_comparison(get_history(), run)
+    return outcome
+
+def changed_solutions(changed_paths, target_file=None):
+    """
+    Map changed files to the solutions to re-run: a changed solution runs itself, and changed
+    test cases re-run the solutions next to them (only the watched one when watching a single file).
+    """
+    solutions = []
+    for path in sorted(changed_paths):
+        if os.path.basename(path) == "test_cases_named.json":
+            folder = os.path.dirname(path)
+            candidates = [target_file] if target_file else [os.path.join(folder, name) for name in SOLUTION_FILES]
+            solutions.extend(candidate for candidate in candidates if os.path.exists(candidate))
+        else:
+            solutions.append(path)
+    return list(dict.fromkeys(solutions))
+
+def watch_solutions(target, args):
+    """
+    Re-run the tests every time a solution or its test cases are saved, until interrupted.
+
+    `target` is a solution file, or a folder whose solution.py/solution.cpp files are all watched.
+    The process and its Python workers stay alive between runs: workers reload a solution only
+    when its file changes, and C++ rebuilds reuse every cached object that did not change.
+    """
+    target = os.path.abspath(target)
+    if os.path.isdir(target):
+        root, target_file = target, None
+        wanted = lambda path: os.path.basename(path) in SOLUTION_FILES + ("test_cases_named.json",)
+    else:
+        root, target_file = os.path.dirname(target), target
+        test_cases_path = os.path.join(root, "test_cases_named.json")
+        wanted = lambda path: path in (target_file, test_cases_path)
+
+    pool = get_python_pool(args.workers, args.timeout, args.memory)
+    pool.start()
+    watcher = create_watcher(root, wanted, args.interval, args.poll)
+    print(f"Watching {target} for changes (Ctrl+C to stop)...")
+    pending = [target_file] if target_file else []
+    try:
+        while True:
+            for solution_file_path in pending:
+                print(f"\n=== {os.path.relpath(solution_file_path)} ({datetime.now():%H:%M:%S}) ===")
+                start = time.perf_counter()
+                run_solution(solution_file_path, args, pool)
+                print(f"Finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+            pending = changed_solutions(watcher.wait(), target_file)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a solution file against its saved test cases.")
+    parser.add_argument('solution_file_path',
+                        help="Path to solution.py or solution.cpp (or a folder of problems with --watch)")
+    parser.add_argument('--profile', choices=sorted(BUILD_PROFILES), default=DEFAULT_PROFILE,
+                        help="C++ build profile")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for Python test cases")
+    parser.add_argument('--timeout', type=float, default=CASE_TIMEOUT, help="Per-case time limit in seconds")
+    parser.add_argument('--memory', type=int, default=CASE_MEMORY_MB, help="Per-case memory limit in MB (0 for none)")
+    parser.add_argument('--bench', action='store_true', help="Benchmark each test case instead of checking outputs")
+    parser.add_argument('--repeat', type=int, default=BENCH_REPEAT, help="Timed runs per test case with --bench")
+    parser.add_argument('--warmup', type=int, default=BENCH_WARMUP, help="Untimed warmup runs per test case with --bench")
+    parser.add_argument('--unordered', action='store_true', help="Ignore the order of list elements in outputs")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Absolute and relative tolerance for comparing floats")
+    parser.add_argument('--fail-fast', action='store_true', help="Stop at the first failing test case")
+    parser.add_argument('--watch', action='store_true', help="Re-run the tests every time the solution is saved")
+    parser.add_argument('--poll', action='store_true', help="Poll for changes instead of using inotify with --watch")
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL, help="Polling interval in seconds")
+    parser.add_argument('--no-history', dest='history', action='store_false', default=RUN_HISTORY,
+                        help="Do not record the run in the run history")
+    parser.add_argument('--compare', action='store_true',
+                        help="Compare the run with the best and most recent earlier runs of the solution")
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_solutions(args.solution_file_path, args)
     else:
-        print("Unsupported language. Please use a Python (.py) or C++ (.cpp) file.")
\ No newline at end of file
+        run_solution(args.solution_file_path, args)
@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+WATCH_INTERVAL = float(os.environ.get("WATCH_INTERVAL", "0.2"))
+WATCH_DEBOUNCE = float(os.environ.get("WATCH_DEBOUNCE", "0.05"))
+SKIPPED_DIRS = {"__pycache__", ".git", ".vscode", "node_modules"}
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+EVENT_HEADER = struct.Struct("iIII")
+
+def walk_dirs(root):
+    """
+    Yield root and every directory below it, skipping hidden, cache and build folders.
+    """
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIPPED_DIRS and not name.startswith(".")]
+        yield dirpath
+
+class PollingWatcher:
+    """
+    Portable watcher that compares file modification times every `interval` seconds.
+    """
+
+    def __init__(self, root, wanted, interval=WATCH_INTERVAL):
+        self.root = root
+        self.wanted = wanted
+        self.interval = interval
+        self.mtimes = self.snapshot()
+
+    def snapshot(self):
+        mtimes = {}
+        for dirpath in walk_dirs(self.root):
+            try:
+                names = os.listdir(dirpath)
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(dirpath, name)
+                if self.wanted(path):
+                    try:
+                        mtimes[path] = os.stat(path).st_mtime_ns
+                    except OSError:
+                        continue
+        return mtimes
+
+    def wait(self):
+        """
+        Block until a wanted file is created or modified and return the set of changed paths.
+        """
+        while True:
+            time.sleep(self.interval)
+            mtimes = self.snapshot()
+            changed = {path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime}
+            self.mtimes = mtimes
+            if changed:
+                return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """
+    Linux watcher built on inotify through ctypes, so saves are noticed immediately
+    without polling. Every directory under root is watched, including ones created later.
+    """
+
+    def __init__(self, root, wanted):
+        self.root = root
+        self.wanted = wanted
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for dirpath in walk_dirs(root):
+            self.add_watch(dirpath)
+
+    def add_watch(self, dirpath):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached")
+            return
+        self.dirs[wd] = dirpath
+
+    def read_events(self):
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; treat everything wanted as changed
+                    changed.update(PollingWatcher(self.root, self.wanted).mtimes)
+                    continue
+                if wd not in self.dirs or not name:
+                    continue
+                path = os.path.join(self.dirs[wd], os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        for dirpath in walk_dirs(path):
+                            self.add_watch(dirpath)
+                elif self.wanted(path):
+                    changed.add(path)
+
+    def wait(self):
+        """
+        Block until a wanted file is written and return the set of changed paths.
+        Events arriving within WATCH_DEBOUNCE seconds are merged, since editors often
+        write a file in several steps.
+        """
+        while True:
+            select.select([self.fd], [], [])
+            changed = self.read_events()
+            while select.select([self.fd], [], [], WATCH_DEBOUNCE)[0]:
+                changed |= self.read_events()
+            changed = {path for path in changed if os.path.exists(path)}
+            if changed:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+def create_watcher(root, wanted, interval=WATCH_INTERVAL, polling=False):
+    """
+    Return an inotify watcher on Linux, or a polling watcher elsewhere or when inotify fails.
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, wanted)
+        except (OSError, AttributeError) as e:
+            print(f"inotify is not available ({e}), polling for changes instead.")
+    return PollingWatcher(root, wanted, interval)